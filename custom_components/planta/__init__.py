@@ -4,25 +4,44 @@ from __future__ import annotations
 
 import json
 import logging
+from pathlib import Path
 
 from homeassistant.const import CONF_TOKEN, Platform
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.device_registry import DeviceEntry
+from homeassistant.helpers.typing import ConfigType
 
 from .const import DOMAIN
-from .coordinator import PlantaConfigEntry, PlantaCoordinator
+from .coordinator import (
+    PlantaConfigEntry,
+    PlantaCoordinator,
+    profile_path,
+    site_identifier,
+    snapshot_store,
+)
 from .pyplanta import Planta
+from .services import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS = [
     Platform.BUTTON,
+    Platform.CALENDAR,
     Platform.IMAGE,
     Platform.SENSOR,
 ]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Planta integration."""
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: PlantaConfigEntry) -> bool:
     """Set up Planta from a config entry."""
@@ -44,6 +63,28 @@ async def async_setup_entry(hass: HomeAssistant, entry: PlantaConfigEntry) -> bo
         refresh_tokens_callback=async_save_tokens,
     )
     coordinator = PlantaCoordinator(hass, entry, client)
+    try:
+        await _async_setup_coordinator(hass, entry, coordinator)
+    except Exception:
+        # the client would otherwise keep refreshing the tokens of the entry
+        await coordinator.async_shutdown()
+        await client.close()
+        raise
+    return True
+
+
+async def _async_setup_coordinator(
+    hass: HomeAssistant, entry: PlantaConfigEntry, coordinator: PlantaCoordinator
+) -> None:
+    """Load or refresh the plants of a coordinator and set up the platforms."""
+    if await coordinator.async_load_snapshot():
+        # set up from the last snapshot and refresh in the background
+        entry.runtime_data = coordinator
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), "planta first refresh"
+        )
+        return
 
     try:
         await coordinator.async_config_entry_first_refresh()
@@ -59,8 +100,6 @@ async def async_setup_entry(hass: HomeAssistant, entry: PlantaConfigEntry) -> bo
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
-    return True
-
 
 async def async_unload_entry(hass: HomeAssistant, entry: PlantaConfigEntry) -> bool:
     """Unload a config entry."""
@@ -68,14 +107,31 @@ async def async_unload_entry(hass: HomeAssistant, entry: PlantaConfigEntry) -> b
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: PlantaConfigEntry) -> None:
+    """Remove the persisted snapshot and the last profile of a config entry."""
+    await snapshot_store(hass, entry.entry_id).async_remove()
+    # missing_ok, as the entry may never have been profiled
+    await hass.async_add_executor_job(
+        Path(profile_path(hass, entry.entry_id)).unlink, True
+    )
+
+
 async def async_remove_config_entry_device(
     hass: HomeAssistant, entry: PlantaConfigEntry, device_entry: DeviceEntry
 ) -> bool:
     """Remove a config entry from a device."""
+    if (DOMAIN, entry.entry_id) in device_entry.identifiers:
+        # the hub device of the account
+        return False
+    coordinator = entry.runtime_data
+    identifiers = {
+        *coordinator.plant_ids,
+        *(
+            site_identifier(entry.entry_id, site)
+            for site in coordinator.due_index.sites
+        ),
+    }
     return not any(
-        identifier
-        for identifier in device_entry.identifiers
-        if identifier[0] == DOMAIN
-        for plant_id in entry.runtime_data.data
-        if plant_id.split(":")[-1] == identifier[1]
+        domain == DOMAIN and identifier in identifiers
+        for domain, identifier in device_entry.identifiers
     )
@@ -6,7 +6,7 @@ from dataclasses import dataclass
 import logging
 
 from homeassistant.components.button import ButtonEntity, ButtonEntityDescription
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ServiceValidationError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
@@ -23,13 +23,20 @@ async def async_setup_entry(
 ) -> None:
     """Set up Planta todo using config entry."""
     coordinator: PlantaCoordinator = entry.runtime_data
-    async_add_entities(
-        [
-            PlantaButtonEntity(coordinator, descriptor, plant_id)
-            for plant_id in coordinator.data
-            for descriptor in BUTTONS
-        ]
-    )
+
+    @callback
+    def async_add_plants(plant_ids: list[str]) -> None:
+        """Add the buttons of some plants."""
+        async_add_entities(
+            [
+                PlantaButtonEntity(coordinator, descriptor, plant_id)
+                for plant_id in plant_ids
+                for descriptor in BUTTONS
+            ]
+        )
+
+    async_add_plants(list(coordinator.data))
+    entry.async_on_unload(coordinator.async_add_new_plants_listener(async_add_plants))
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -71,7 +78,8 @@ class PlantaButtonEntity(PlantaEntity, ButtonEntity):
     @property
     def entity_registry_enabled_default(self) -> bool:
         """Return if the entity should be enabled when first added to the entity registry."""
-        return self.plant["actions"][self.entity_description.field]["next"] is not None
+        action = self.plant.actions.get(self.entity_description.field)
+        return action is not None and action.next is not None
 
     async def async_press(self) -> None:
         """Handle the button press."""
@@ -81,4 +89,6 @@ class PlantaButtonEntity(PlantaEntity, ButtonEntity):
             )
 
         await self.coordinator.client.plant_action_complete(self.plant_id, action)
-        await self.coordinator.async_refresh_plant(self.plant_id)
+        await self.coordinator.async_request_plant_refresh(
+            [self.plant_id], local_action=True
+        )
@@ -0,0 +1,88 @@
+"""Planta calendar entity."""
+
+from __future__ import annotations
+
+from datetime import datetime
+import logging
+
+from homeassistant.components.calendar import CalendarEntity, CalendarEvent
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity import EntityDescription
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.util import dt as dt_util
+
+from .coordinator import PlantaConfigEntry, PlantaCoordinator
+from .entity import PlantaHubEntity
+from .schedule import Interval
+
+_LOGGER = logging.getLogger(__name__)
+
+ACTION_NAMES = {
+    "cleaning": "Cleaning",
+    "fertilizing": "Fertilizing",
+    "misting": "Misting",
+    "progressUpdate": "Progress update",
+    "repotting": "Repotting",
+    "watering": "Watering",
+}
+
+CALENDAR = EntityDescription(key="schedule", translation_key="schedule")
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: PlantaConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Planta calendar using config entry."""
+    coordinator: PlantaCoordinator = entry.runtime_data
+    async_add_entities([PlantaCalendarEntity(coordinator, CALENDAR)])
+
+
+class PlantaCalendarEntity(PlantaHubEntity, CalendarEntity):
+    """Planta calendar entity, with the completed and next actions of every plant."""
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        return self.coordinator.last_update_success
+
+    @property
+    def event(self) -> CalendarEvent | None:
+        """Return the current or next upcoming event."""
+        if interval := self.coordinator.calendar_index.upcoming(dt_util.now()):
+            return self._event(interval)
+        return None
+
+    async def async_get_events(
+        self, hass: HomeAssistant, start_date: datetime, end_date: datetime
+    ) -> list[CalendarEvent]:
+        """Return the events overlapping a range of time."""
+        return [
+            event
+            for interval in self.coordinator.calendar_index.overlapping(
+                start_date, end_date
+            )
+            if (event := self._event(interval))
+        ]
+
+    async def async_added_to_hass(self) -> None:
+        """Update the current event when the plants change."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_listener(self.async_write_ha_state)
+        )
+
+    @callback
+    def _event(self, interval: Interval) -> CalendarEvent | None:
+        """Return the all-day event of an action interval."""
+        if not (plant := self.coordinator.get_plant(interval.plant_id)):
+            return None
+        state = "completed" if interval.completed else "next"
+        return CalendarEvent(
+            start=interval.start.date(),
+            end=interval.end.date(),
+            summary=f"{ACTION_NAMES[interval.action_type]} {plant.name}",
+            description="Completed" if interval.completed else "Scheduled",
+            uid=f"{interval.plant_id}-{interval.action_type}-{state}",
+        )
@@ -11,11 +11,25 @@ from typing import Any
 from httpx import HTTPStatusError
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
 from homeassistant.const import CONF_CODE, CONF_TOKEN
+from homeassistant.core import callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from .const import DOMAIN
+from .const import (
+    CONF_MAX_UPDATE_INTERVAL,
+    CONF_MIN_UPDATE_INTERVAL,
+    CONF_SNAPSHOT_MAX_AGE,
+    DEFAULT_MAX_UPDATE_INTERVAL,
+    DEFAULT_MIN_UPDATE_INTERVAL,
+    DEFAULT_SNAPSHOT_MAX_AGE,
+    DOMAIN,
+)
 from .pyplanta import Planta
 from .pyplanta.exceptions import PlantaError, UnauthorizedError
 
@@ -23,6 +37,19 @@ _LOGGER = logging.getLogger(__name__)
 
 
 STEP_USER_DATA_SCHEMA = vol.Schema({vol.Required(CONF_CODE): str})
+OPTIONS_SCHEMA = vol.Schema(
+    {
+        vol.Required(
+            CONF_MIN_UPDATE_INTERVAL, default=DEFAULT_MIN_UPDATE_INTERVAL
+        ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Required(
+            CONF_MAX_UPDATE_INTERVAL, default=DEFAULT_MAX_UPDATE_INTERVAL
+        ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Required(CONF_SNAPSHOT_MAX_AGE, default=DEFAULT_SNAPSHOT_MAX_AGE): vol.All(
+            vol.Coerce(int), vol.Range(min=1)
+        ),
+    }
+)
 
 
 class PlantaConfigFlow(ConfigFlow, domain=DOMAIN):
@@ -32,6 +59,12 @@ class PlantaConfigFlow(ConfigFlow, domain=DOMAIN):
 
     tokens: dict[str, str] | None = None
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Get the options flow for this handler."""
+        return PlantaOptionsFlow()
+
     async def async_step_reauth(
         self, entry_data: Mapping[str, Any]
     ) -> ConfigFlowResult:
@@ -107,3 +140,30 @@ class PlantaConfigFlow(ConfigFlow, domain=DOMAIN):
         finally:
             await client.close()
         return errors
+
+
+class PlantaOptionsFlow(OptionsFlow):
+    """Handle an options flow for Planta."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the options."""
+        errors = {}
+
+        if user_input is not None:
+            if (
+                user_input[CONF_MIN_UPDATE_INTERVAL]
+                > user_input[CONF_MAX_UPDATE_INTERVAL]
+            ):
+                errors["base"] = "invalid_update_interval"
+            else:
+                return self.async_create_entry(data=user_input)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=self.add_suggested_values_to_schema(
+                OPTIONS_SCHEMA, user_input or self.config_entry.options
+            ),
+            errors=errors,
+        )
@@ -3,3 +3,15 @@
 from typing import Final
 
 DOMAIN: Final = "planta"
+
+EVENT_ACTION_DUE: Final = "planta_action_due"
+
+CONF_MIN_UPDATE_INTERVAL: Final = "min_update_interval"
+CONF_MAX_UPDATE_INTERVAL: Final = "max_update_interval"
+CONF_SNAPSHOT_MAX_AGE: Final = "snapshot_max_age"
+
+# minutes
+DEFAULT_MIN_UPDATE_INTERVAL: Final = 2
+DEFAULT_MAX_UPDATE_INTERVAL: Final = 60
+# hours
+DEFAULT_SNAPSHOT_MAX_AGE: Final = 24
@@ -2,29 +2,152 @@
 
 from __future__ import annotations
 
-from datetime import timedelta
+import asyncio
+from collections.abc import Callable, Iterable
+from contextlib import nullcontext
+from datetime import datetime, timedelta
+from hashlib import sha256
+import json
 import logging
+import sys
+import time
 from typing import Any
 
-import async_timeout
+from aiohttp import ClientError
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_point_in_utc_time,
+    async_track_time_interval,
+)
+from homeassistant.helpers.storage import STORAGE_DIR, Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN
+from .const import (
+    CONF_MAX_UPDATE_INTERVAL,
+    CONF_MIN_UPDATE_INTERVAL,
+    CONF_SNAPSHOT_MAX_AGE,
+    DEFAULT_MAX_UPDATE_INTERVAL,
+    DEFAULT_MIN_UPDATE_INTERVAL,
+    DEFAULT_SNAPSHOT_MAX_AGE,
+    DOMAIN,
+    EVENT_ACTION_DUE,
+)
+from .profiler import Profiler
 from .pyplanta import Planta
-from .pyplanta.exceptions import UnauthorizedError
+from .pyplanta.exceptions import CircuitOpenError, PlantaError, UnauthorizedError
+from .pyplanta.metrics import Histogram
+from .pyplanta.models import Plant, project
+from .schedule import DueIndex, Interval, IntervalIndex
 
 _LOGGER = logging.getLogger(__name__)
 
 UPDATE_INTERVAL = timedelta(minutes=5)
+# poll at the minimum interval within these windows of a due date or local action
+DUE_WINDOW = timedelta(hours=1)
+LOCAL_ACTION_WINDOW = timedelta(minutes=15)
+TICK_INTERVAL = timedelta(minutes=15)
+# longest between full syncs, the polls in between only refresh hot plants
+FULL_SYNC_INTERVAL = timedelta(hours=1)
+# seconds to collect plant refresh requests before fetching them as one batch
+REFRESH_COOLDOWN = 1.5
+REFRESH_DURATION_BUCKETS = (0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# plants sampled to estimate the memory used per plant
+MEMORY_SAMPLE_SIZE = 20
+
+# longest a profile runs, as allocations are traced process-wide meanwhile
+PROFILE_MAX_DURATION = timedelta(minutes=30)
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 60
 
 type PlantaConfigEntry = ConfigEntry[PlantaCoordinator]
 
 
-class PlantaCoordinator(DataUpdateCoordinator[dict[str, dict[str, Any]]]):
+def device_identifier(plant_id: str) -> str:
+    """Return the device identifier of a plant, which is its id without the user id."""
+    return plant_id.split(":")[-1]
+
+
+def site_identifier(entry_id: str, site: str) -> str:
+    """Return the device identifier of a site of an account."""
+    return f"{entry_id}-site-{site}"
+
+
+def fingerprint(plant: dict[str, Any]) -> int:
+    """Return a fingerprint of the plant's content."""
+    return hash(json.dumps(plant, separators=(",", ":")))
+
+
+def deep_sizeof(obj: Any, seen: set[int]) -> int:
+    """Return the size of an object and everything it references not yet seen."""
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(
+            deep_sizeof(key, seen) + deep_sizeof(value, seen)
+            for key, value in obj.items()
+        )
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    elif slots := getattr(type(obj), "__slots__", None):
+        size += sum(deep_sizeof(getattr(obj, slot, None), seen) for slot in slots)
+    return size
+
+
+def poll_phase(entry_id: str) -> float:
+    """Return the deterministic phase, between 0 and 1, of an entry's polls."""
+    return int.from_bytes(sha256(entry_id.encode()).digest()[:8]) / 2**64
+
+
+def snapshot_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return the store of the plant snapshot of a config entry."""
+    return Store(hass, 1, f"{DOMAIN}.{entry_id}.snapshot")
+
+
+def profile_path(hass: HomeAssistant, entry_id: str) -> str:
+    """Return the path of the last profile of a config entry."""
+    return hass.config.path(STORAGE_DIR, DOMAIN, "profiles", f"{entry_id}.prof")
+
+
+def next_action_dates(plant: Plant) -> list[datetime]:
+    """Return the next date of each scheduled action of a plant."""
+    return [
+        action.next.date
+        for _, action in plant.actions.items()
+        if action.next and action.next.date
+    ]
+
+
+def action_intervals(plant_id: str, plant: Plant) -> list[Interval]:
+    """Return the completed and next actions of a plant, each over its local day."""
+    intervals = []
+    for action_type, action in plant.actions.items():
+        for record, completed in ((action.completed, True), (action.next, False)):
+            if record and record.date:
+                day = dt_util.as_local(record.date).date()
+                intervals.append(
+                    Interval(
+                        dt_util.start_of_local_day(day),
+                        dt_util.start_of_local_day(day + timedelta(days=1)),
+                        plant_id,
+                        action_type,
+                        completed,
+                    )
+                )
+    return intervals
+
+
+class PlantaCoordinator(DataUpdateCoordinator[dict[str, Plant]]):
     """Planta data update coordinator."""
 
     def __init__(
@@ -40,27 +163,722 @@ class PlantaCoordinator(DataUpdateCoordinator[dict[str, dict[str, Any]]]):
             always_update=False,
         )
         self.client = client
+        self._fingerprints: dict[str, int] = {}
+        self._changed_plant_ids: set[str] | None = None
+        self._plant_listeners: dict[str | None, set[CALLBACK_TYPE]] = {}
+        self._listeners_available = True
+        self._last_local_action: datetime | None = None
+        self._local_actions: dict[str, datetime] = {}
+        self._full_sync_requested = False
+        self._poll_plant_ids: set[str] | None = None
+        self._tick_listeners: set[Callable[[datetime], None]] = set()
+        self._unsub_tick: CALLBACK_TYPE | None = None
+        self._page_count = 1
+        self._poll_started = 0.0
+        self._poll_done = asyncio.Event()
+        self._poll_done.set()
+        self._pending_refresh: set[str] = set()
+        self._pending_since: float | None = None
+        self._snapshot_store = snapshot_store(hass, config_entry.entry_id)
+        self._last_fetched: datetime | None = None
+        self.snapshot_stale = False
+        self._phase = poll_phase(config_entry.entry_id)
+        self.refresh_duration = Histogram(REFRESH_DURATION_BUCKETS)
+        self.memory_per_plant: dict[str, float] | None = None
+        # device identifier -> plant id
+        self.plant_ids: dict[str, str] = {}
+        self._plants_indexed = False
+        self.due_index = DueIndex()
+        self.calendar_index = IntervalIndex()
+        # actions due up to this date have had their event fired
+        self._actions_due_until: datetime | None = None
+        self._unsub_action_due: CALLBACK_TYPE | None = None
+        self._action_due_at: datetime | None = None
+        self._new_plants_listeners: set[Callable[[list[str]], None]] = set()
+        self._metrics_listeners: set[CALLBACK_TYPE] = set()
+        self.profiler: Profiler | None = None
+        self.last_profile: dict[str, Any] | None = None
+        self._unsub_profile: CALLBACK_TYPE | None = None
+        self._plant_refresh_debouncer = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=REFRESH_COOLDOWN,
+            immediate=False,
+            function=self._async_refresh_pending_plants,
+        )
 
-    def get_plant(self, plant_id: str) -> dict[str, Any] | None:
+    @property
+    def min_update_interval(self) -> timedelta:
+        """Return the configured minimum update interval."""
+        options = self.config_entry.options
+        minutes = options.get(CONF_MIN_UPDATE_INTERVAL, DEFAULT_MIN_UPDATE_INTERVAL)
+        return timedelta(minutes=minutes)
+
+    @property
+    def max_update_interval(self) -> timedelta:
+        """Return the configured maximum update interval."""
+        options = self.config_entry.options
+        minutes = options.get(CONF_MAX_UPDATE_INTERVAL, DEFAULT_MAX_UPDATE_INTERVAL)
+        return timedelta(minutes=minutes)
+
+    @property
+    def snapshot_max_age(self) -> timedelta:
+        """Return the age after which the persisted snapshot is stale."""
+        options = self.config_entry.options
+        hours = options.get(CONF_SNAPSHOT_MAX_AGE, DEFAULT_SNAPSHOT_MAX_AGE)
+        return timedelta(hours=hours)
+
+    async def async_load_snapshot(self) -> bool:
+        """Load the last persisted plant snapshot, returning `True` if loaded."""
+        if not (snapshot := await self._snapshot_store.async_load()):
+            return False
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            _LOGGER.debug("Ignoring snapshot with version %s", snapshot.get("version"))
+            return False
+        try:
+            fetched = datetime.fromisoformat(snapshot["timestamp"])
+            plants = {
+                plant_id: Plant.from_dict(plant)
+                for plant_id, plant in snapshot["plants"].items()
+            }
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.warning("Ignoring invalid snapshot: %s", err)
+            return False
+        self.data = plants
+        self._async_update_schedule(None)
+        self._async_update_plant_index()
+        self._last_fetched = fetched
+        self.snapshot_stale = dt_util.utcnow() - fetched > self.snapshot_max_age
+        return True
+
+    @callback
+    def _async_save_snapshot(self) -> None:
+        """Schedule saving the plant snapshot."""
+        self._snapshot_store.async_delay_save(self._snapshot_data, SNAPSHOT_SAVE_DELAY)
+
+    @callback
+    def _snapshot_data(self) -> dict[str, Any]:
+        """Return the plant snapshot to persist."""
+        return {
+            "version": SNAPSHOT_VERSION,
+            "timestamp": (self._last_fetched or dt_util.utcnow()).isoformat(),
+            "plants": {
+                plant_id: plant.as_dict() for plant_id, plant in self.data.items()
+            },
+        }
+
+    def get_plant(self, plant_id: str) -> Plant | None:
         """Get a plant by it's id."""
         return self.data.get(plant_id, None) if self.data else None
 
-    async def _async_update_data(self) -> dict[str, dict[str, Any]]:
-        """Fetch the latest data."""
+    async def async_refresh(self) -> None:
+        """Refresh data with a full sync."""
+        self._full_sync_requested = True
+        await super().async_refresh()
+
+    async def _async_update_data(self) -> dict[str, Plant]:
+        """Fetch the latest data.
+
+        Only hot plants are refreshed between full syncs, which run at least
+        every hour or when a refresh is requested.
+        """
+        self._poll_started = time.monotonic()
+        self._poll_done.clear()
+        full_sync, self._full_sync_requested = self._full_sync_requested, False
+        plant_ids = None if full_sync else self._async_partial_refresh_plants()
+        self._poll_plant_ids = None if plant_ids is None else set(plant_ids)
+        profiler = self.profiler
         try:
-            async with async_timeout.timeout(10):
-                data = await self.client.get_plants()
+            with profiler.section("refresh") if profiler else nullcontext():
+                if plant_ids is None:
+                    return await self._async_fetch_plants()
+                return await self._async_fetch_hot_plants(plant_ids)
+        finally:
+            self.refresh_duration.observe(time.monotonic() - self._poll_started)
+            self._poll_done.set()
+            for metrics_callback in list(self._metrics_listeners):
+                metrics_callback()
+            if profiler and profiler is self.profiler and profiler.refresh_done():
+                # stop after the listeners are updated with the refreshed data
+                self.hass.loop.call_soon(self._async_stop_profile)
+
+    async def _async_fetch_plants(self) -> dict[str, Plant]:
+        """Fetch every page of plants."""
+        plants: dict[str, dict[str, Any]] = {}
+        not_modified = True
+        pages = 0
+        try:
+            async for page in self.client.iter_plants():
+                pages += 1
+                not_modified &= page.not_modified
+                if not page.not_modified:
+                    self._async_sample_memory(page.plants)
+                plants.update((plant["id"], project(plant)) for plant in page.plants)
         except UnauthorizedError as err:
             raise ConfigEntryAuthFailed from err
+        except CircuitOpenError as err:
+            return self._async_circuit_open(err)
         except Exception as ex:
             _LOGGER.error(ex)
             raise UpdateFailed("Couldn't read from Planta") from ex
-        if data is None:
-            raise ConfigEntryNotReady
-        return {plant["id"]: plant for plant in data.get("plants", [])}
-
-    async def async_refresh_plant(self, plant_id: str) -> None:
-        """Fetch the latest data for a plant."""
-        if data := await self.client.get_plant(plant_id):
-            self.data[plant_id] = data
+        self._page_count = pages
+        self._last_fetched = dt_util.utcnow()
+        self.snapshot_stale = False
+        self._async_save_snapshot()
+        if not_modified and self.data:
+            # returning the same data lets the coordinator skip waking listeners
+            self._changed_plant_ids = set()
+            data = self.data
+        else:
+            data = self._async_index_changes(plants)
+        self.update_interval = self._async_stagger(
+            self._async_next_update_interval(data)
+        )
+        return data
+
+    async def _async_fetch_hot_plants(self, plant_ids: list[str]) -> dict[str, Plant]:
+        """Refresh only the hot plants, individually."""
+        _LOGGER.debug("Refreshing %s hot plants", len(plant_ids))
+        changed, errors = await self._async_get_plants(plant_ids)
+        if errors and len(errors) == len(plant_ids):
+            err = errors[0]
+            if isinstance(err, UnauthorizedError):
+                raise ConfigEntryAuthFailed from err
+            if isinstance(err, CircuitOpenError):
+                return self._async_circuit_open(err)
+            raise UpdateFailed("Couldn't read from Planta") from err
+        self._changed_plant_ids = set(changed)
+        data = {**self.data, **changed} if changed else self.data
+        if changed:
+            self._async_save_snapshot()
+        self.update_interval = self._async_stagger(
+            self._async_next_update_interval(data)
+        )
+        return data
+
+    async def _async_get_plants(
+        self, plant_ids: Iterable[str]
+    ) -> tuple[dict[str, Plant], list[Exception]]:
+        """Fetch plants individually, returning those that changed and any errors."""
+        result = await self.client.get_plants_by_id(plant_ids)
+        _LOGGER.debug(
+            "Fetched %s plants in %.2fs (%.2fs of requests)",
+            len(result.plants) + len(result.errors),
+            result.elapsed,
+            result.request_time,
+        )
+        for plant_id, err in result.errors.items():
+            _LOGGER.warning("Unable to refresh %s: %s", plant_id, err)
+        changed: dict[str, Plant] = {}
+        for plant_id, data in result.plants.items():
+            if data and self._fingerprints.get(plant_id) != (
+                value := fingerprint(data := project(data))
+            ):
+                changed[plant_id] = Plant.from_dict(data)
+                self._fingerprints[plant_id] = value
+        return changed, list(result.errors.values())
+
+    @callback
+    def _async_circuit_open(self, err: CircuitOpenError) -> dict[str, Plant]:
+        """Keep serving the last known data while the API is down."""
+        if not self.data:
+            raise UpdateFailed("Couldn't read from Planta") from err
+        _LOGGER.debug("Skipping update: %s", err)
+        self._changed_plant_ids = set()
+        self.update_interval = max(
+            timedelta(seconds=err.retry_in), self.min_update_interval
+        )
+        return self.data
+
+    @callback
+    def _async_partial_refresh_plants(self) -> list[str] | None:
+        """Return the hot plants to refresh, or `None` when a full sync is due."""
+        if not self.data or self._async_full_sync_due_in() <= timedelta(0):
+            return None
+        if len(plant_ids := self._async_hot_plants()) > self._page_count:
+            # a full sync takes fewer requests
+            return None
+        return plant_ids
+
+    @callback
+    def _async_full_sync_due_in(self) -> timedelta:
+        """Return the time left until the next poll has to be a full sync.
+
+        Leaves the minimum interval for the poll to be staggered, so full syncs
+        stay within the full sync interval of each other.
+        """
+        if self._last_fetched is None:
+            return timedelta(0)
+        return (
+            self._last_fetched
+            + FULL_SYNC_INTERVAL
+            - self.min_update_interval
+            - dt_util.utcnow()
+        )
+
+    @callback
+    def _async_hot_plants(self) -> list[str]:
+        """Return the plants with an action due, just completed or done locally."""
+        now = dt_util.utcnow()
+        self._local_actions = {
+            plant_id: date
+            for plant_id, date in self._local_actions.items()
+            if now - date < LOCAL_ACTION_WINDOW
+        }
+        return [
+            plant_id
+            for plant_id, plant in self.data.items()
+            if plant_id in self._local_actions
+            or any(date < now + DUE_WINDOW for date in next_action_dates(plant))
+            or any(
+                now - action.completed.date < DUE_WINDOW
+                for _, action in plant.actions.items()
+                if action.completed and action.completed.date
+            )
+        ]
+
+    @callback
+    def _async_stagger(self, interval: timedelta) -> timedelta:
+        """Delay an update interval to the entry's phase within the minimum interval.
+
+        Accounts that would poll at the same time are spread across the minimum
+        interval instead of sending their requests in one burst.
+        """
+        slot = self.min_update_interval.total_seconds()
+        due = time.time() + interval.total_seconds()
+        return interval + timedelta(seconds=(self._phase * slot - due) % slot)
+
+    @callback
+    def _async_sample_memory(self, plants: list[dict[str, Any]]) -> None:
+        """Estimate the memory used per plant, before and after projection.
+
+        The response cache also keeps the projected API data of each plant.
+        """
+        if self.memory_per_plant is not None or not plants:
+            return
+        sample = plants[:MEMORY_SAMPLE_SIZE]
+        raw_seen: set[int] = set()
+        projected_seen: set[int] = set()
+        cached_seen: set[int] = set()
+        # keep the models alive so their ids aren't reused while measuring
+        cached = [project(plant) for plant in sample]
+        models = [Plant.from_dict(plant) for plant in cached]
+        raw = sum(deep_sizeof(plant, raw_seen) for plant in sample)
+        projected = sum(deep_sizeof(model, projected_seen) for model in models)
+        self.memory_per_plant = {
+            "raw": raw / len(sample),
+            "projected": projected / len(sample),
+            "cached": sum(deep_sizeof(plant, cached_seen) for plant in cached)
+            / len(sample),
+        }
+
+    @callback
+    def _async_next_update_interval(self, data: dict[str, Plant]) -> timedelta:
+        """Return the update interval based on upcoming due dates.
+
+        Polls at the minimum interval around the earliest due date and right
+        after local actions, backing off to the maximum interval otherwise, but
+        no later than the next full sync.
+        """
+        floor = self.min_update_interval
+        ceiling = min(
+            self.max_update_interval, max(self._async_full_sync_due_in(), floor)
+        )
+        now = dt_util.utcnow()
+        if (
+            self._last_local_action
+            and now - self._last_local_action < LOCAL_ACTION_WINDOW
+        ):
+            return floor
+        next_due = min(
+            (
+                date
+                for plant in data.values()
+                for date in next_action_dates(plant)
+                if date > now - DUE_WINDOW
+            ),
+            default=None,
+        )
+        if next_due is None:
+            return ceiling
+        return min(max(next_due - now - DUE_WINDOW, floor), ceiling)
+
+    @callback
+    def _async_index_changes(
+        self, plants: dict[str, dict[str, Any]]
+    ) -> dict[str, Plant]:
+        """Parse the plants that changed, reusing the previous models for the rest."""
+        previous = self.data or {}
+        fingerprints: dict[str, int] = {}
+        changed: set[str] = set()
+        data: dict[str, Plant] = {}
+        for plant_id, plant in plants.items():
+            fingerprints[plant_id] = value = fingerprint(plant)
+            if self._fingerprints.get(plant_id) == value and plant_id in previous:
+                # keep the previous object so the coordinator's equality check
+                # short-circuits on identity
+                data[plant_id] = previous[plant_id]
+            else:
+                data[plant_id] = Plant.from_dict(plant)
+                changed.add(plant_id)
+        changed.update(self._fingerprints.keys() - fingerprints.keys())
+        self._fingerprints = fingerprints
+        self._changed_plant_ids = changed
+        return data if changed or not previous else previous
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for data updates, optionally only for the plant id in context."""
+        remove_listener = super().async_add_listener(update_callback, context)
+        listeners = self._plant_listeners.setdefault(context, set())
+        listeners.add(update_callback)
+
+        @callback
+        def remove_plant_listener() -> None:
+            """Remove update listener."""
+            remove_listener()
+            listeners.discard(update_callback)
+            if not listeners:
+                self._plant_listeners.pop(context, None)
+
+        return remove_plant_listener
+
+    @callback
+    def async_add_new_plants_listener(
+        self, new_plants_callback: Callable[[list[str]], None]
+    ) -> Callable[[], None]:
+        """Listen for plants added after setup, to create their entities."""
+        self._new_plants_listeners.add(new_plants_callback)
+
+        @callback
+        def remove_new_plants_listener() -> None:
+            """Remove new plants listener."""
+            self._new_plants_listeners.discard(new_plants_callback)
+
+        return remove_new_plants_listener
+
+    @callback
+    def _async_update_plant_index(self) -> None:
+        """Index the plants by device identifier, adding and removing plants."""
+        previous = self.plant_ids
+        self.plant_ids = {
+            device_identifier(plant_id): plant_id for plant_id in self.data
+        }
+        if not self._plants_indexed:
+            # remove the devices of plants deleted while not loaded
+            self._plants_indexed = True
+            self._async_remove_stale_devices()
+            return
+        if self.plant_ids.keys() == previous.keys():
+            return
+        if added := [
+            plant_id
+            for identifier, plant_id in self.plant_ids.items()
+            if identifier not in previous
+        ]:
+            _LOGGER.debug("Adding plants %s", added)
+            for new_plants_callback in list(self._new_plants_listeners):
+                new_plants_callback(added)
+        if removed := previous.keys() - self.plant_ids.keys():
+            _LOGGER.debug("Removing plants %s", removed)
+            self._async_remove_devices(removed)
+
+    @callback
+    def _async_update_schedule(self, changed: set[str] | None) -> None:
+        """Index the actions of the plants that changed, or of every plant."""
+        sites = self.due_index.sites
+        if changed is None:
+            self.due_index.rebuild(self.data)
+            self.calendar_index.rebuild(
+                {
+                    plant_id: action_intervals(plant_id, plant)
+                    for plant_id, plant in self.data.items()
+                }
+            )
+        else:
+            for plant_id in changed:
+                plant = self.data.get(plant_id)
+                self.due_index.update(plant_id, plant)
+                self.calendar_index.update(
+                    plant_id, action_intervals(plant_id, plant) if plant else ()
+                )
+        if self._plants_indexed and (removed := sites - self.due_index.sites):
+            _LOGGER.debug("Removing sites %s", removed)
+            entry_id = self.config_entry.entry_id
+            self._async_remove_devices(
+                site_identifier(entry_id, site) for site in removed
+            )
+        self._async_schedule_action_due()
+
+    @callback
+    def _async_schedule_action_due(self) -> None:
+        """Schedule a single timer for the earliest upcoming due date of any plant."""
+        now = dt_util.utcnow()
+        if self._action_due_at is None or self._action_due_at > now:
+            # only fire for dates after this check, not for actions already due
+            # when first indexed, loaded from the snapshot or moved by a refresh
+            self._actions_due_until = now
+        due = self.due_index.next_due(self._actions_due_until)
+        if (due_at := due[0] if due else None) == self._action_due_at:
+            return
+        if self._unsub_action_due:
+            self._unsub_action_due()
+            self._unsub_action_due = None
+        self._action_due_at = due_at
+        if due_at is not None:
+            self._unsub_action_due = async_track_point_in_utc_time(
+                self.hass, self._async_action_due, due_at
+            )
+
+    @callback
+    def _async_action_due(self, _: datetime) -> None:
+        """Fire an event for each plant action that became due."""
+        self._unsub_action_due = self._action_due_at = None
+        now = dt_util.utcnow()
+        device_registry = dr.async_get(self.hass)
+        while (due := self.due_index.next_due(self._actions_due_until)) and (
+            due[0] <= now
+        ):
+            date, actions = due
+            for plant_id, action_type in actions:
+                device = device_registry.async_get_device(
+                    identifiers={(DOMAIN, device_identifier(plant_id))}
+                )
+                self.hass.bus.async_fire(
+                    EVENT_ACTION_DUE,
+                    {
+                        "config_entry_id": self.config_entry.entry_id,
+                        "device_id": device.id if device else None,
+                        "plant_id": plant_id,
+                        "action_type": action_type,
+                        "date": date.isoformat(),
+                    },
+                )
+            self._actions_due_until = date
+        self._async_schedule_action_due()
+
+    @callback
+    def _async_remove_stale_devices(self) -> None:
+        """Remove the devices of plants and sites that no longer exist."""
+        device_registry = dr.async_get(self.hass)
+        entry_id = self.config_entry.entry_id
+        identifiers = {
+            entry_id,
+            *self.plant_ids,
+            *(site_identifier(entry_id, site) for site in self.due_index.sites),
+        }
+        self._async_remove_devices(
+            identifier
+            for device in dr.async_entries_for_config_entry(device_registry, entry_id)
+            for domain, identifier in device.identifiers
+            if domain == DOMAIN and identifier not in identifiers
+        )
+
+    @callback
+    def _async_remove_devices(self, identifiers: Iterable[str]) -> None:
+        """Remove the devices of plants, which also removes their entities."""
+        device_registry = dr.async_get(self.hass)
+        for identifier in identifiers:
+            if device := device_registry.async_get_device(
+                identifiers={(DOMAIN, identifier)}
+            ):
+                device_registry.async_update_device(
+                    device.id, remove_config_entry_id=self.config_entry.entry_id
+                )
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update listeners, profiling the state writes while a profile runs."""
+        profiler = self.profiler
+        with profiler.section("state_writes") if profiler else nullcontext():
+            self._async_update_listeners()
+
+    @callback
+    def _async_update_listeners(self) -> None:
+        """Update listeners of the plants that changed, or all if unknown."""
+        changed, self._changed_plant_ids = self._changed_plant_ids, None
+        if self.data is not None:
+            self._async_update_schedule(changed)
+            self._async_update_plant_index()
+        available_changed = self.last_update_success != self._listeners_available
+        self._listeners_available = self.last_update_success
+        if changed is None or available_changed:
+            super().async_update_listeners()
+            return
+        for context in (None, *changed):
+            for update_callback in list(self._plant_listeners.get(context, ())):
+                update_callback()
+
+    @callback
+    def async_add_tick_listener(
+        self, tick_callback: Callable[[datetime], None]
+    ) -> Callable[[], None]:
+        """Listen for the shared ticker used by time since sensors."""
+        if not self._tick_listeners:
+            self._unsub_tick = async_track_time_interval(
+                self.hass, self._async_tick, TICK_INTERVAL
+            )
+        self._tick_listeners.add(tick_callback)
+
+        @callback
+        def remove_tick_listener() -> None:
+            """Remove tick listener."""
+            self._tick_listeners.discard(tick_callback)
+            if not self._tick_listeners and self._unsub_tick:
+                self._unsub_tick()
+                self._unsub_tick = None
+
+        return remove_tick_listener
+
+    @callback
+    def async_add_metrics_listener(
+        self, metrics_callback: CALLBACK_TYPE
+    ) -> Callable[[], None]:
+        """Listen for refreshes, whether or not the plants changed."""
+        self._metrics_listeners.add(metrics_callback)
+
+        @callback
+        def remove_metrics_listener() -> None:
+            """Remove metrics listener."""
+            self._metrics_listeners.discard(metrics_callback)
+
+        return remove_metrics_listener
+
+    @callback
+    def _async_tick(self, now: datetime) -> None:
+        """Pass a single timestamp to every tick listener."""
+        for tick_callback in list(self._tick_listeners):
+            tick_callback(now)
+
+    @callback
+    def _async_mark_local_action(self, plant_ids: Iterable[str] = ()) -> None:
+        """Record a local action and switch to the minimum update interval."""
+        self._last_local_action = now = dt_util.utcnow()
+        self._local_actions.update(dict.fromkeys(plant_ids, now))
+        if self.update_interval != (floor := self.min_update_interval):
+            self.update_interval = floor
+            self._schedule_refresh()
+
+    async def async_complete_actions(
+        self, plant_ids: list[str], action_type: str, max_concurrency: int
+    ) -> dict[str, str | None]:
+        """Complete an action for many plants and refresh once.
+
+        Returns the error, if any, for each plant id.
+        """
+        self._async_mark_local_action(plant_ids)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _async_complete(plant_id: str) -> str | None:
+            async with semaphore:
+                try:
+                    await self.client.plant_action_complete(plant_id, action_type)
+                except (PlantaError, ClientError, asyncio.TimeoutError) as err:
+                    _LOGGER.warning(
+                        "Unable to complete %s for %s", action_type, plant_id
+                    )
+                    return str(err) or type(err).__name__
+            return None
+
+        try:
+            errors = await asyncio.gather(*map(_async_complete, plant_ids))
+        finally:
+            # refresh the plants completed so far, even if cancelled
+            await self.async_refresh()
+        return dict(zip(plant_ids, errors, strict=True))
+
+    async def async_request_plant_refresh(
+        self, plant_ids: list[str], *, local_action: bool = False
+    ) -> None:
+        """Request a refresh of some plants.
+
+        Requests are collected for a short cooldown and fetched as one batch.
+        """
+        if local_action:
+            self._async_mark_local_action(plant_ids)
+        if not self._pending_refresh:
+            self._pending_since = time.monotonic()
+        self._pending_refresh.update(plant_ids)
+        await self._plant_refresh_debouncer.async_call()
+
+    async def _async_refresh_pending_plants(self) -> None:
+        """Fetch the pending plants with whichever request is cheaper."""
+        plant_ids, self._pending_refresh = self._pending_refresh, set()
+        requested_at, self._pending_since = self._pending_since, None
+        if not plant_ids or requested_at is None:
+            return
+        if (
+            not self._poll_done.is_set()
+            and self._poll_started >= requested_at
+            and (self._poll_plant_ids is None or plant_ids <= self._poll_plant_ids)
+        ):
+            # a poll that started after the request already covers it
+            await self._poll_done.wait()
+            return
+        if len(plant_ids) > self._page_count:
+            await self.async_refresh()
+            return
+
+        changed, _ = await self._async_get_plants(plant_ids)
+        if changed:
+            self.data.update(changed)
+            self._changed_plant_ids = set(changed)
             self.async_update_listeners()
+            self._async_save_snapshot()
+
+    @callback
+    def async_start_profile(self, refreshes: int) -> None:
+        """Profile the next refreshes and the state writes that follow them."""
+        # each profile overwrites the previous one of the entry
+        path = profile_path(self.hass, self.config_entry.entry_id)
+        self.profiler = Profiler(refreshes, path)
+        self.profiler.start(self.hass.loop, dt_util.utcnow())
+        self._unsub_profile = async_call_later(
+            self.hass, PROFILE_MAX_DURATION, self._async_stop_profile
+        )
+        _LOGGER.info("Profiling the next %s refreshes", refreshes)
+        # start with a refresh instead of waiting for the next poll
+        self.config_entry.async_create_background_task(
+            self.hass, self.async_request_refresh(), f"{DOMAIN} profile refresh"
+        )
+
+    @callback
+    def _async_stop_profile(self, _now: datetime | None = None) -> None:
+        """Stop profiling and collect the results in the background."""
+        if self._unsub_profile:
+            self._unsub_profile()
+            self._unsub_profile = None
+        if not (profiler := self.profiler):
+            return
+        self.profiler = None
+        profiler.stop(dt_util.utcnow())
+        self.config_entry.async_create_background_task(
+            self.hass, self._async_collect_profile(profiler), f"{DOMAIN} profile"
+        )
+
+    async def _async_collect_profile(self, profiler: Profiler) -> None:
+        """Collect the results of a profile, for diagnostics."""
+        try:
+            self.last_profile = await self.hass.async_add_executor_job(
+                profiler.results, len(self.data or ())
+            )
+        except (OSError, RuntimeError, TypeError) as err:
+            _LOGGER.error("Unable to collect the profile to %s: %s", profiler.path, err)
+            return
+        _LOGGER.info("Profile written to %s", profiler.path)
+
+    async def async_shutdown(self) -> None:
+        """Cancel any scheduled call, and ignore new runs."""
+        await super().async_shutdown()
+        self._plant_refresh_debouncer.async_shutdown()
+        if self._unsub_action_due:
+            self._unsub_action_due()
+            self._unsub_action_due = self._action_due_at = None
+        if self._unsub_profile:
+            self._unsub_profile()
+            self._unsub_profile = None
+        if self.profiler:
+            self.profiler.cancel()
+            self.profiler = None
@@ -13,4 +13,21 @@ async def async_get_config_entry_diagnostics(
     hass: HomeAssistant, entry: PlantaConfigEntry
 ) -> dict[str, Any]:
     """Return diagnostics for a config entry."""
-    return entry.runtime_data.data
+    coordinator = entry.runtime_data
+    client = coordinator.client
+    return {
+        "plants": {
+            plant_id: plant.as_dict() for plant_id, plant in coordinator.data.items()
+        },
+        "memory_per_plant": coordinator.memory_per_plant,
+        "profile": coordinator.last_profile,
+        "metrics": {
+            "api": client.metrics.as_dict(),
+            "refresh_duration": coordinator.refresh_duration.as_dict(),
+            "rate_limiter": client.rate_limiter.as_dict(),
+            "circuit_breakers": {
+                key: breaker.as_dict()
+                for key, breaker in client.circuit_breakers.items()
+            },
+        },
+    }
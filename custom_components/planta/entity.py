@@ -2,13 +2,13 @@
 
 from __future__ import annotations
 
-from typing import Any
-
-from homeassistant.helpers.entity import DeviceInfo, EntityDescription
+from homeassistant.helpers.device_registry import DeviceEntryType
+from homeassistant.helpers.entity import DeviceInfo, Entity, EntityDescription
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
-from .coordinator import PlantaCoordinator
+from .coordinator import PlantaCoordinator, device_identifier, site_identifier
+from .pyplanta.models import Plant
 
 
 class PlantaEntity(CoordinatorEntity[PlantaCoordinator]):
@@ -23,25 +23,70 @@ class PlantaEntity(CoordinatorEntity[PlantaCoordinator]):
         plant_id: str,
     ) -> None:
         """Construct a Planta entity."""
-        super().__init__(coordinator)
+        # subscribe to updates for this plant only
+        super().__init__(coordinator, context=plant_id)
         self.entity_description = description
         self.plant_id = plant_id
 
-        # strip user id from plant_id
-        plant_id = plant_id.split(":")[-1]
-
-        self._attr_unique_id = f"{plant_id}-{description.key}"
-        names = self.plant.get("names", {})
+        identifier = device_identifier(plant_id)
+        self._attr_unique_id = f"{identifier}-{description.key}"
+        plant = self.plant
         self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, plant_id)},
-            name=names.get("custom") or names.get("localizedName"),
+            identifiers={(DOMAIN, identifier)},
+            name=plant.name,
             manufacturer="Planta",
-            model=names.get("scientific")
-            + (f" '{variety}'" if (variety := names.get("variety")) else ""),
-            suggested_area=self.plant["site"]["name"],
+            model=plant.scientific_name
+            + (f" '{variety}'" if (variety := plant.variety) else ""),
+            suggested_area=plant.site_name,
         )
 
     @property
-    def plant(self) -> dict[str, Any] | None:
+    def available(self) -> bool:
+        """Return if entity is available."""
+        return super().available and not self.coordinator.snapshot_stale
+
+    @property
+    def plant(self) -> Plant | None:
         """Get plant data."""
         return self.coordinator.get_plant(self.plant_id)
+
+
+class PlantaHubEntity(Entity):
+    """Base class for entities of the account, on its hub device.
+
+    Entities of a site are on a device of the site instead.
+    """
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        coordinator: PlantaCoordinator,
+        description: EntityDescription,
+        site: str | None = None,
+    ) -> None:
+        """Construct a Planta hub entity."""
+        self.coordinator = coordinator
+        self.entity_description = description
+        self.site = site
+        entry = coordinator.config_entry
+        if site is None:
+            self._attr_unique_id = f"{entry.entry_id}-{description.key}"
+            self._attr_device_info = DeviceInfo(
+                identifiers={(DOMAIN, entry.entry_id)},
+                name=entry.title,
+                manufacturer="Planta",
+                entry_type=DeviceEntryType.SERVICE,
+            )
+            return
+        identifier = site_identifier(entry.entry_id, site)
+        self._attr_unique_id = f"{identifier}-{description.key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, identifier)},
+            name=site,
+            manufacturer="Planta",
+            entry_type=DeviceEntryType.SERVICE,
+            suggested_area=site,
+            via_device=(DOMAIN, entry.entry_id),
+        )
@@ -2,14 +2,26 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+from typing import Any
 
-from homeassistant.components.image import ImageEntity, ImageEntityDescription
+from aiohttp import web
+
+from homeassistant.components.image import (
+    DATA_COMPONENT,
+    ImageEntity,
+    ImageEntityDescription,
+    ImageView,
+)
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.util.hass_dict import HassKey
 
+from .const import DOMAIN
 from .coordinator import PlantaConfigEntry, PlantaCoordinator
 from .entity import PlantaEntity
+from .image_cache import CachedImage, async_get_image_cache
+
+DATA_THUMBNAIL_VIEW: HassKey[bool] = HassKey(f"{DOMAIN}_thumbnail_view")
 
 
 async def async_setup_entry(
@@ -19,12 +31,29 @@ async def async_setup_entry(
 ) -> None:
     """Set up Planta camera using config entry."""
     coordinator: PlantaCoordinator = entry.runtime_data
-    async_add_entities(
-        [
-            PlantaImageEntity(coordinator, IMAGE, plant_id)
-            for plant_id in coordinator.data
-        ]
-    )
+
+    if not hass.data.get(DATA_THUMBNAIL_VIEW):
+        hass.http.register_view(PlantaThumbnailView(hass.data[DATA_COMPONENT]))
+        hass.data[DATA_THUMBNAIL_VIEW] = True
+
+    @callback
+    def async_add_plants(plant_ids: list[str]) -> None:
+        """Add the images of some plants and prefetch them."""
+        async_add_entities(
+            [PlantaImageEntity(coordinator, IMAGE, plant_id) for plant_id in plant_ids]
+        )
+        entry.async_create_background_task(
+            hass,
+            async_get_image_cache(hass).async_prefetch(
+                (plant.image_url, plant.image_last_updated)
+                for plant_id in plant_ids
+                if (plant := coordinator.data[plant_id]).image_url
+            ),
+            "planta image prefetch",
+        )
+
+    async_add_plants(list(coordinator.data))
+    entry.async_on_unload(coordinator.async_add_new_plants_listener(async_add_plants))
 
 
 IMAGE = ImageEntityDescription(key="image", name=None)
@@ -33,6 +62,9 @@ IMAGE = ImageEntityDescription(key="image", name=None)
 class PlantaImageEntity(PlantaEntity, ImageEntity):
     """Planta image entity."""
 
+    # the thumbnail URL changes with the access token
+    _unrecorded_attributes = frozenset({"thumbnail_url"})
+
     def __init__(
         self,
         coordinator: PlantaCoordinator,
@@ -43,19 +75,65 @@ class PlantaImageEntity(PlantaEntity, ImageEntity):
         super().__init__(coordinator, description, plant_id)
         ImageEntity.__init__(self, coordinator.hass)
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return entity specific state attributes."""
+        return {
+            "thumbnail_url": PlantaThumbnailView.url.format(entity_id=self.entity_id)
+            + f"?token={self.access_tokens[-1]}"
+        }
+
     async def async_added_to_hass(self) -> None:
         self._handle_coordinator_update()
         await super().async_added_to_hass()
 
+    async def async_image(self) -> bytes | None:
+        """Return bytes of image from the image cache."""
+        if (image := await self._async_cached_image(thumbnail=False)) is None:
+            return None
+        self._attr_content_type = image.content_type
+        return image.content
+
+    async def async_thumbnail(self) -> CachedImage | None:
+        """Return the downscaled image from the image cache."""
+        return await self._async_cached_image(thumbnail=True)
+
+    async def _async_cached_image(self, *, thumbnail: bool) -> CachedImage | None:
+        """Return an image from the image cache."""
+        if not self._attr_image_url:
+            return None
+        return await async_get_image_cache(self.hass).async_get(
+            self._attr_image_url, self._attr_image_last_updated, thumbnail=thumbnail
+        )
+
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
         if not self.plant:
             return
-        image = self.plant.get("image", {})
-        if (url := image.get("url")) != self._attr_image_url:
-            if last_updated := image.get("lastUpdated"):
-                self._attr_image_last_updated = datetime.fromisoformat(last_updated)
+        url, last_updated = self.plant.image_url, self.plant.image_last_updated
+        if url != self._attr_image_url or (
+            last_updated and last_updated != self._attr_image_last_updated
+        ):
+            if last_updated:
+                self._attr_image_last_updated = last_updated
             self._attr_image_url = url
             self._cached_image = None
         super()._handle_coordinator_update()
+
+
+class PlantaThumbnailView(ImageView):
+    """View to serve the downscaled image of a Planta image entity."""
+
+    url = "/api/planta/thumbnail/{entity_id}"
+    name = "api:planta:thumbnail"
+
+    async def handle(
+        self, request: web.Request, image_entity: ImageEntity
+    ) -> web.StreamResponse:
+        """Serve the thumbnail."""
+        if not isinstance(image_entity, PlantaImageEntity):
+            raise web.HTTPNotFound
+        if (image := await image_entity.async_thumbnail()) is None:
+            raise web.HTTPInternalServerError
+        return web.Response(body=image.content, content_type=image.content_type)
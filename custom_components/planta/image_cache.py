@@ -0,0 +1,240 @@
+"""Planta image cache."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+from datetime import datetime
+from hashlib import sha256
+import io
+import logging
+from pathlib import Path
+from typing import Any, Final, NamedTuple
+
+try:
+    from PIL import Image
+except ImportError:  # thumbnails fall back to the original image
+    Image = None
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import STORAGE_DIR, Store
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_IMAGE_CACHE: HassKey[PlantaImageCache] = HassKey(f"{DOMAIN}_image_cache")
+
+STORAGE_KEY: Final = f"{DOMAIN}.image_cache"
+STORAGE_VERSION: Final = 1
+SAVE_DELAY: Final = 10
+
+DEFAULT_MAX_BYTES: Final = 100 * 1024 * 1024
+PREFETCH_CONCURRENCY: Final = 4
+THUMBNAIL_SIZE: Final = (256, 256)
+THUMBNAIL_CONTENT_TYPE: Final = "image/jpeg"
+
+
+class CachedImage(NamedTuple):
+    """A cached image."""
+
+    content: bytes
+    content_type: str
+
+
+def _write_image(path: Path, digest: str, content: bytes) -> int:
+    """Write an image and its thumbnail, returning the thumbnail size."""
+    path.mkdir(parents=True, exist_ok=True)
+    (path / digest).write_bytes(content)
+    if Image is None:
+        return 0
+    try:
+        with Image.open(io.BytesIO(content)) as image:
+            image.thumbnail(THUMBNAIL_SIZE)
+            buffer = io.BytesIO()
+            image.convert("RGB").save(buffer, "JPEG", quality=85)
+    except OSError as err:
+        _LOGGER.debug("Unable to create thumbnail for %s: %s", digest, err)
+        return 0
+    (path / f"{digest}.thumb").write_bytes(thumbnail := buffer.getvalue())
+    return len(thumbnail)
+
+
+def _read_file(file: Path) -> bytes | None:
+    """Read a file, if it exists."""
+    try:
+        return file.read_bytes()
+    except FileNotFoundError:
+        return None
+
+
+def _remove_files(path: Path, digests: Iterable[str]) -> None:
+    """Remove images and their thumbnails."""
+    for digest in digests:
+        (path / digest).unlink(missing_ok=True)
+        (path / f"{digest}.thumb").unlink(missing_ok=True)
+
+
+def async_get_image_cache(hass: HomeAssistant) -> PlantaImageCache:
+    """Return the image cache shared by all config entries."""
+    if (cache := hass.data.get(DATA_IMAGE_CACHE)) is None:
+        cache = hass.data[DATA_IMAGE_CACHE] = PlantaImageCache(hass)
+    return cache
+
+
+class PlantaImageCache:
+    """Content-addressed image cache with LRU eviction by total bytes.
+
+    Entries are keyed by url and validated against the image's last updated
+    date. Files are named by the sha256 digest of their content.
+    """
+
+    def __init__(self, hass: HomeAssistant, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        """Initialize the cache."""
+        self.hass = hass
+        self.max_bytes = max_bytes
+        self._path = Path(hass.config.path(STORAGE_DIR, DOMAIN, "images"))
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        # url -> entry, least recently used first
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._pending: dict[str, asyncio.Future[dict[str, Any] | None]] = {}
+        self._load_task: asyncio.Task[None] | None = None
+
+    @property
+    def total_bytes(self) -> int:
+        """Return the total bytes of the cached images and thumbnails."""
+        digests = {entry["digest"]: entry for entry in self._entries.values()}
+        return sum(
+            entry["size"] + entry["thumbnail_size"] for entry in digests.values()
+        )
+
+    async def _async_load(self) -> None:
+        """Load the cache index once."""
+        if self._load_task is None:
+            self._load_task = self.hass.async_create_task(self._async_load_index())
+        await self._load_task
+
+    async def _async_load_index(self) -> None:
+        """Load the cache index."""
+        data = await self._store.async_load() or {}
+        self._entries = data.get("entries", {})
+
+    async def async_get(
+        self, url: str, last_updated: datetime | None, *, thumbnail: bool = False
+    ) -> CachedImage | None:
+        """Return an image from the cache, downloading it if missing or stale."""
+        await self._async_load()
+        entry = self._entries.get(url)
+        if entry is None or entry["last_updated"] != _isoformat(last_updated):
+            if (entry := await self._async_fetch(url, last_updated)) is None:
+                return None
+        else:
+            # mark as recently used
+            self._entries[url] = self._entries.pop(url)
+            self._async_schedule_save()
+
+        if thumbnail and entry["thumbnail_size"]:
+            file, content_type = f"{entry['digest']}.thumb", THUMBNAIL_CONTENT_TYPE
+        else:
+            file, content_type = entry["digest"], entry["content_type"]
+        content = await self.hass.async_add_executor_job(_read_file, self._path / file)
+        if content is None:
+            # removed from disk, download it again next time
+            self._entries.pop(url, None)
+            self._async_schedule_save()
+            return None
+        return CachedImage(content, content_type)
+
+    async def async_prefetch(
+        self,
+        images: Iterable[tuple[str, datetime | None]],
+        concurrency: int = PREFETCH_CONCURRENCY,
+    ) -> None:
+        """Download images that aren't cached yet."""
+        await self._async_load()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _async_prefetch(url: str, last_updated: datetime | None) -> None:
+            async with semaphore:
+                await self._async_fetch(url, last_updated)
+
+        await asyncio.gather(
+            *(
+                _async_prefetch(url, last_updated)
+                for url, last_updated in images
+                if (entry := self._entries.get(url)) is None
+                or entry["last_updated"] != _isoformat(last_updated)
+            )
+        )
+
+    async def _async_fetch(
+        self, url: str, last_updated: datetime | None
+    ) -> dict[str, Any] | None:
+        """Download an image, sharing the result with concurrent callers."""
+        if (future := self._pending.get(url)) is None:
+            future = self._pending[url] = asyncio.ensure_future(
+                self._async_download(url, last_updated)
+            )
+            future.add_done_callback(lambda _: self._pending.pop(url, None))
+        return await asyncio.shield(future)
+
+    async def _async_download(
+        self, url: str, last_updated: datetime | None
+    ) -> dict[str, Any] | None:
+        """Download an image and store it with its thumbnail."""
+        session = async_get_clientsession(self.hass)
+        try:
+            async with session.get(url) as resp:
+                resp.raise_for_status()
+                content = await resp.read()
+                content_type = resp.content_type
+        except Exception as ex:  # pylint: disable=broad-except
+            _LOGGER.warning("Unable to download image %s: %s", url, ex)
+            return None
+
+        digest = sha256(content).hexdigest()
+        thumbnail_size = await self.hass.async_add_executor_job(
+            _write_image, self._path, digest, content
+        )
+        previous = self._entries.pop(url, None)
+        self._entries[url] = entry = {
+            "digest": digest,
+            "last_updated": _isoformat(last_updated),
+            "content_type": content_type,
+            "size": len(content),
+            "thumbnail_size": thumbnail_size,
+        }
+        if previous and all(
+            e["digest"] != previous["digest"] for e in self._entries.values()
+        ):
+            await self.hass.async_add_executor_job(
+                _remove_files, self._path, [previous["digest"]]
+            )
+        await self._async_evict()
+        self._async_schedule_save()
+        return entry
+
+    async def _async_evict(self) -> None:
+        """Evict the least recently used images until under the size limit."""
+        if (total := self.total_bytes) <= self.max_bytes:
+            return
+        evicted: set[str] = set()
+        for url in list(self._entries):
+            if total <= self.max_bytes or len(self._entries) == 1:
+                break
+            entry = self._entries.pop(url)
+            if all(e["digest"] != entry["digest"] for e in self._entries.values()):
+                evicted.add(entry["digest"])
+                total -= entry["size"] + entry["thumbnail_size"]
+        await self.hass.async_add_executor_job(_remove_files, self._path, evicted)
+
+    def _async_schedule_save(self) -> None:
+        """Schedule saving the cache index."""
+        self._store.async_delay_save(lambda: {"entries": self._entries}, SAVE_DELAY)
+
+
+def _isoformat(value: datetime | None) -> str | None:
+    """Return a date as an ISO 8601 string, if any."""
+    return value.isoformat() if value else None
@@ -0,0 +1,226 @@
+"""Planta profiler."""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+from collections.abc import Iterator
+from contextlib import contextmanager
+import cProfile
+from datetime import datetime
+import logging
+from pathlib import Path
+import pstats
+import threading
+import time
+import tracemalloc
+from typing import Any, Final
+
+_LOGGER = logging.getLogger(__name__)
+
+# entries listed of the functions and allocation sites
+PROFILE_TOP: Final = 20
+# seconds between checks of how late the event loop runs a callback
+LAG_INTERVAL: Final = 0.05
+
+PACKAGE_FILES: Final = str(Path(__file__).parent / "*")
+
+# the profilers of every account share tracemalloc, which the last one to
+# finish stops if a profiler started it
+_tracing_lock = threading.Lock()
+_tracing_profilers = 0
+_tracing_started = False
+
+
+def _acquire_tracing() -> None:
+    """Trace allocations, starting tracemalloc if it isn't tracing."""
+    global _tracing_profilers, _tracing_started  # noqa: PLW0603
+    with _tracing_lock:
+        if not _tracing_profilers and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracing_started = True
+        _tracing_profilers += 1
+
+
+def _release_tracing() -> None:
+    """Stop tracing allocations if no other profiler traces them and one started."""
+    global _tracing_profilers, _tracing_started  # noqa: PLW0603
+    with _tracing_lock:
+        _tracing_profilers -= 1
+        if not _tracing_profilers and _tracing_started:
+            tracemalloc.stop()
+            _tracing_started = False
+
+
+class Profiler:
+    """Profile coordinator refreshes and the state writes that follow them.
+
+    The refreshes await the API, so their profile also includes whatever else
+    runs on the event loop meanwhile. Allocations are traced from the start of
+    the profile to its end.
+    """
+
+    def __init__(self, refreshes: int, path: str) -> None:
+        """Initialize the profiler.
+
+        Args:
+            refreshes (int): The number of refreshes to profile.
+            path (str): The path to write the profile stats to.
+        """
+        self.refreshes = refreshes
+        self.remaining = refreshes
+        self.path = path
+        self.profile = cProfile.Profile()
+        self.started: datetime | None = None
+        self.finished: datetime | None = None
+        # section name -> durations in seconds
+        self.sections: dict[str, list[float]] = {}
+        self.max_lag = 0.0
+        self.total_lag = 0.0
+        self._depth = 0
+        self._profiled = False
+        self._tracing = False
+        self._snapshot: tracemalloc.Snapshot | None = None
+        self._lag_handle: asyncio.TimerHandle | None = None
+
+    def start(self, loop: asyncio.AbstractEventLoop, now: datetime) -> None:
+        """Start tracing allocations and checking the event loop lag."""
+        self.started = now
+        _acquire_tracing()
+        self._tracing = True
+        self._snapshot = tracemalloc.take_snapshot()
+        self._check_lag(loop, loop.time())
+
+    def _check_lag(self, loop: asyncio.AbstractEventLoop, expected: float) -> None:
+        """Record how late this callback ran, then check again."""
+        lag = max(loop.time() - expected, 0.0)
+        self.max_lag = max(self.max_lag, lag)
+        self.total_lag += lag
+        expected = loop.time() + LAG_INTERVAL
+        self._lag_handle = loop.call_at(expected, self._check_lag, loop, expected)
+
+    @contextmanager
+    def section(self, name: str) -> Iterator[None]:
+        """Profile a section, such as a refresh or the state writes after it."""
+        if not self._depth:
+            try:
+                self.profile.enable()
+            except ValueError as err:
+                # another profiler is active
+                _LOGGER.debug("Unable to profile %s: %s", name, err)
+                yield
+                return
+            self._profiled = True
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.sections.setdefault(name, []).append(time.perf_counter() - start)
+            self._depth -= 1
+            if not self._depth:
+                self.profile.disable()
+
+    def refresh_done(self) -> bool:
+        """Count a profiled refresh, returning `True` if it was the last one."""
+        self.remaining -= 1
+        return self.remaining <= 0
+
+    def stop(self, now: datetime) -> None:
+        """Stop checking the event loop lag."""
+        self.finished = now
+        if self._lag_handle:
+            self._lag_handle.cancel()
+            self._lag_handle = None
+
+    def cancel(self) -> None:
+        """Stop without collecting the results."""
+        if self._lag_handle:
+            self._lag_handle.cancel()
+            self._lag_handle = None
+        self._release_tracing()
+        self._snapshot = None
+
+    def _release_tracing(self) -> None:
+        """Release tracing allocations, once."""
+        if self._tracing:
+            self._tracing = False
+            _release_tracing()
+
+    def results(self, plant_count: int) -> dict[str, Any]:
+        """Stop tracing allocations and return the results, writing the profile stats.
+
+        Takes a while with many allocations traced, so is run in an executor.
+        """
+        allocations: list[tracemalloc.StatisticDiff] = []
+        planta_bytes: int | None = None
+        try:
+            if self._snapshot and tracemalloc.is_tracing():
+                snapshot = tracemalloc.take_snapshot()
+                allocations = snapshot.compare_to(self._snapshot, "lineno")
+                planta_bytes = sum(
+                    stat.size
+                    for stat in snapshot.filter_traces(
+                        [tracemalloc.Filter(True, PACKAGE_FILES)]
+                    ).statistics("filename")
+                )
+        finally:
+            self._release_tracing()
+            self._snapshot = None
+
+        functions = []
+        prof = None
+        # there are no stats if no section could enable the profiler
+        if self._profiled:
+            stats = pstats.Stats(self.profile)
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            stats.dump_stats(self.path)
+            prof = base64.b64encode(Path(self.path).read_bytes()).decode()
+            # (filename, line, name) -> (primitive calls, calls, total, cumulative, callers)
+            functions = sorted(
+                stats.stats.items(),  # type: ignore[attr-defined]
+                key=lambda item: item[1][2],
+                reverse=True,
+            )
+        return {
+            "started": self.started.isoformat() if self.started else None,
+            "finished": self.finished.isoformat() if self.finished else None,
+            "refreshes": self.refreshes - max(self.remaining, 0),
+            "functions": [
+                {
+                    "function": f"{filename}:{line}({name})",
+                    "calls": stat[1],
+                    "total_time": round(stat[2], 6),
+                    "cumulative_time": round(stat[3], 6),
+                }
+                for (filename, line, name), stat in functions[:PROFILE_TOP]
+            ],
+            "allocations": [
+                {
+                    "location": str(stat.traceback),
+                    "size_diff": stat.size_diff,
+                    "size": stat.size,
+                    "count_diff": stat.count_diff,
+                }
+                for stat in allocations[:PROFILE_TOP]
+            ],
+            "bytes_per_plant": (
+                planta_bytes / plant_count
+                if planta_bytes is not None and plant_count
+                else None
+            ),
+            "event_loop": {
+                "max_lag": round(self.max_lag, 6),
+                "total_lag": round(self.total_lag, 6),
+                **{
+                    name: {
+                        "count": len(durations),
+                        "total": round(sum(durations), 6),
+                        "max": round(max(durations), 6),
+                    }
+                    for name, durations in self.sections.items()
+                },
+            },
+            "prof_path": self.path if prof else None,
+            "prof": prof,
+        }
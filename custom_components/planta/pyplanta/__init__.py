@@ -1,23 +1,71 @@
 """Planta API client."""
 
-from asyncio import Lock
+import asyncio
 import logging
-from typing import Any, Callable, Final
+import time
+from typing import Any, AsyncIterator, Callable, Final, Iterable, NamedTuple
+from urllib.parse import urlsplit
 
-from aiohttp import ClientSession
-import jwt
+from aiohttp import ClientError, ClientSession, ClientTimeout
 
-from .exceptions import PlantaError, UnauthorizedError
+from .auth import DEFAULT_REFRESH_MARGIN, TokenManager, async_single_flight
+from .cache import ResponseCache
+from .decoder import JSONDecoder
+from .exceptions import PlantaError, ServerError, UnauthorizedError
+from .metrics import EndpointMetrics, Metrics
+from .models import project
+from .ratelimit import RateLimiter, get_rate_limiter
+from .resilience import (
+    BACKOFF_MAX,
+    MAX_RETRIES,
+    RETRY_STATUSES,
+    CircuitBreaker,
+    backoff,
+    endpoint_key,
+    parse_retry_after,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
 API_V1_ENDPOINT: Final = "https://public.planta-api.com/v1"
+DEFAULT_MAX_CONCURRENCY: Final = 8
+# seconds each request may take, not counting the rate limiter wait
+DEFAULT_REQUEST_TIMEOUT: Final = 10.0
+
+
+class PlantsPage(NamedTuple):
+    """A page of plants."""
+
+    plants: list[dict[str, Any]]
+    cursor: str | None
+    not_modified: bool
+
+
+class PlantsResult(NamedTuple):
+    """Plants fetched by id."""
+
+    plants: dict[str, dict[str, Any]]
+    errors: dict[str, Exception]
+    # seconds from the first request to the last response, including the time
+    # spent waiting for the rate limiter and before retries
+    elapsed: float
+    # seconds spent sending each request and reading its response, summed
+    request_time: float
+
+
+def _compact(data: dict[str, Any]) -> dict[str, Any]:
+    """Return a response with only the plant fields that are used, for caching."""
+    plants = data.get("data")
+    if isinstance(plants, list):
+        return {**data, "data": [project(plant) for plant in plants]}
+    if isinstance(plants, dict):
+        return {**data, "data": project(plants)}
+    return data
 
 
 class Planta:
     """Planta API client class."""
 
-    _lock = Lock()
     _tokens: dict[str, str] | None = None
     _refresh_tokens_callback: Callable[[dict[str, str]], None] | None = None
 
@@ -27,14 +75,31 @@ class Planta:
         session: ClientSession | None = None,
         tokens: dict[str, str] | None = None,
         refresh_tokens_callback: Callable[[dict[str, str]], None] | None = None,
+        token_refresh_margin: float = DEFAULT_REFRESH_MARGIN,
+        max_retries: int = MAX_RETRIES,
+        request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+        rate_limiter: RateLimiter | None = None,
+        json_decoder: JSONDecoder | None = None,
     ) -> None:
-        """Initialize the client."""
+        """Initialize the client.
+
+        Clients sharing a session also share its rate limiter, unless one is given.
+        """
         self._client = session if session else ClientSession()
         self._should_close = session is None
+        self._rate_limiter = rate_limiter or get_rate_limiter(self._client)
         self._headers: dict[str, str] = {}
+        self._cache = ResponseCache()
+        self._metrics = Metrics()
+        self._decoder = json_decoder or JSONDecoder()
+        self._circuit_breakers: dict[str, CircuitBreaker] = {}
+        self.max_retries = max_retries
+        self._timeout = ClientTimeout(total=request_timeout)
+        self._token_manager = TokenManager(
+            self._async_refresh_tokens, margin=token_refresh_margin
+        )
         if tokens and "accessToken" in tokens:
-            self._tokens = tokens
-            self._headers["Authorization"] = f"Bearer {tokens['accessToken']}"
+            self._set_tokens(tokens)
         if refresh_tokens_callback:
             self._refresh_tokens_callback = refresh_tokens_callback
 
@@ -43,78 +108,148 @@ class Planta:
         """Return the tokens, if any."""
         return self._tokens
 
+    @property
+    def circuit_breakers(self) -> dict[str, CircuitBreaker]:
+        """Return the circuit breakers, by endpoint."""
+        return self._circuit_breakers
+
+    @property
+    def metrics(self) -> Metrics:
+        """Return the request metrics."""
+        return self._metrics
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        """Return the rate limiter, which exposes the time spent waiting."""
+        return self._rate_limiter
+
+    @property
+    def token_manager(self) -> TokenManager:
+        """Return the token manager, which exposes the refresh state."""
+        return self._token_manager
+
     async def authorize(self, code: str) -> None:
         """Exchange OTP for an access and refresh token."""
         result = await self._request(
             "POST", f"{API_V1_ENDPOINT}/auth/authorize", json={"code": code}
         )
-        self._tokens = tokens = result["data"]
-        self._headers["Authorization"] = (
-            f"{tokens['tokenType']} {tokens['accessToken']}"
-        )
+        self._set_tokens(result["data"])
 
     async def refresh_tokens(self, *, force: bool = False) -> None:
-        """Refresh the tokens."""
+        """Refresh the tokens.
+
+        Concurrent callers share a single in-flight refresh.
+        """
+        if not force and self._is_access_token_valid():
+            return
+        await self._token_manager.async_refresh()
+
+    async def _async_refresh_tokens(self) -> None:
+        """Exchange the refresh token for new tokens."""
         if not self._tokens:
             raise UnauthorizedError("App has not yet been authorized")
         if "refreshToken" not in self._tokens:
             raise PlantaError("Unable to refresh tokens - refresh token is missing")
-        async with self._lock:
-            if not force and self._is_access_token_valid():
-                return
-            if "Authorization" in self._headers:
-                self._headers.pop("Authorization")
-            result = await self._request(
+        refresh_token = self._tokens["refreshToken"]
+        result = await async_single_flight(
+            refresh_token,
+            lambda: self._request(
                 "POST",
                 f"{API_V1_ENDPOINT}/auth/refreshToken",
-                json={"refreshToken": self._tokens["refreshToken"]},
-            )
-            self._tokens = tokens = result["data"]
-            self._headers["Authorization"] = (
-                f"{tokens['tokenType']} {tokens['accessToken']}"
-            )
-            if self._refresh_tokens_callback:
-                try:
-                    self._refresh_tokens_callback(self.tokens)
-                except Exception as ex:
-                    _LOGGER.error(ex)
+                json={"refreshToken": refresh_token},
+            ),
+        )
+        self._set_tokens(result["data"])
+        self._metrics.token_refreshes += 1
+        if self._refresh_tokens_callback:
+            try:
+                self._refresh_tokens_callback(self.tokens)
+            except Exception as ex:
+                _LOGGER.error(ex)
+
+    def _set_tokens(self, tokens: dict[str, str]) -> None:
+        """Set the tokens and the authorization header."""
+        self._tokens = tokens
+        self._headers["Authorization"] = (
+            f"{tokens.get('tokenType', 'Bearer')} {tokens['accessToken']}"
+        )
+        self._token_manager.set_access_token(tokens["accessToken"])
 
     async def close(self) -> None:
         """Close the client."""
+        self._token_manager.cancel()
         if self._should_close:
             await self._client.close()
             self._client = None
 
+    def clear_cache(self) -> None:
+        """Clear the conditional request cache."""
+        self._cache.clear()
+
+    async def iter_plants(
+        self, *, cursor: str | None = None, page_size: int | None = None
+    ) -> AsyncIterator[PlantsPage]:
+        """Iterate over plants one page at a time.
+
+        Args:
+            cursor (str | None): The starting cursor for pagination. Default is None.
+            page_size (int | None): The number of plants to request per page, sent as `limit`. Defaults to the API default.
+
+        Yields:
+            PlantsPage: The plants in the page, the next page cursor, if any, and whether the page was served unmodified from the cache, with only the plant fields the models use.
+        """
+        pages = 0
+        while True:
+            params: dict[str, Any] = {}
+            if cursor:
+                params["cursor"] = cursor
+            if page_size:
+                params["limit"] = page_size
+            result = await self._request(
+                "GET", f"{API_V1_ENDPOINT}/addedPlants", params=params
+            )
+            pages += 1
+            cursor = result.get("pagination", {}).get("nextPage")
+
+            yield PlantsPage(result.get("data", []), cursor, result["status"] == 304)
+
+            if not cursor:
+                # pages per complete listing
+                self._metrics.pages.observe(pages)
+                return
+
     async def get_plants(
-        self, *, cursor: str | None = None, fetch_all: bool = True
+        self,
+        *,
+        cursor: str | None = None,
+        fetch_all: bool = True,
+        page_size: int | None = None,
     ) -> dict[str, list[dict[str, Any]] | str | None]:
         """Get plants.
 
         Args:
             cursor (str | None): The starting cursor for pagination. Default is None.
             fetch_all (bool): Whether to fetch all pages or just the first page. Defaults to True.
+            page_size (int | None): The number of plants to request per page. Defaults to the API default.
 
         Returns:
-            dict: A dictionary containing plant data and optionally the next page cursor.
+            dict: A dictionary containing plant data, optionally the next page cursor
+                and whether every page was served unmodified from the cache.
         """
         plants = []
+        not_modified = True
 
-        while True:
-            result = await self._request(
-                "GET",
-                f"{API_V1_ENDPOINT}/addedPlants",
-                **{"params": {"cursor": cursor} if cursor else {}},
-            )
-
-            plants.extend(result.get("data", []))
-            cursor = result.get("pagination", {}).get("nextPage")
-
-            if not fetch_all or not cursor:
+        async for page in self.iter_plants(cursor=cursor, page_size=page_size):
+            plants.extend(page.plants)
+            not_modified &= page.not_modified
+            cursor = page.cursor
+            if not fetch_all:
                 break
 
         return {
             "plants": plants,
             "cursor": cursor,
+            "not_modified": not_modified,
         }
 
     async def get_plant(self, plant_id: str) -> dict[str, Any]:
@@ -122,6 +257,47 @@ class Planta:
         result = await self._request("GET", f"{API_V1_ENDPOINT}/addedPlants/{plant_id}")
         return result.get("data", {})
 
+    async def get_plants_by_id(
+        self,
+        plant_ids: Iterable[str],
+        *,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ) -> PlantsResult:
+        """Get plants by id, concurrently.
+
+        Requests still wait for the rate limiter, so batches up to its burst (20
+        requests by default) run concurrently, while larger ones are paced by its
+        rate (10 per second by default).
+
+        Args:
+            plant_ids (Iterable[str]): The ids of the plants to get.
+            max_concurrency (int): The maximum number of requests in flight. Defaults to 8.
+
+        Returns:
+            PlantsResult: The plants that were fetched and the error for each plant that wasn't, by id, with the elapsed and summed request time.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        plants: dict[str, dict[str, Any]] = {}
+        errors: dict[str, Exception] = {}
+        timing: list[float] = []
+
+        async def _get_plant(plant_id: str) -> None:
+            async with semaphore:
+                try:
+                    result = await self._request(
+                        "GET",
+                        f"{API_V1_ENDPOINT}/addedPlants/{plant_id}",
+                        timing=timing,
+                    )
+                except (PlantaError, ClientError, asyncio.TimeoutError) as err:
+                    errors[plant_id] = err
+                else:
+                    plants[plant_id] = result.get("data", {})
+
+        start = time.perf_counter()
+        await asyncio.gather(*map(_get_plant, dict.fromkeys(plant_ids)))
+        return PlantsResult(plants, errors, time.perf_counter() - start, sum(timing))
+
     async def plant_action_complete(self, plant_id: str, action_type: str) -> bool:
         """Mark a plant action as completed."""
         result = await self._request(
@@ -133,46 +309,135 @@ class Planta:
 
     def _is_access_token_valid(self) -> bool:
         """Return `True` if the access token is still valid."""
-        if self.tokens is None:
-            return False
-        try:
-            jwt.decode(
-                self.tokens["accessToken"],
-                options={"verify_signature": False, "verify_exp": True},
-                leeway=-30,
-            )
-        except jwt.ExpiredSignatureError:
-            return False
-        return True
+        return self._token_manager.is_valid()
 
     async def _request(
-        self, method: str, url: str, **kwargs: Any
+        self,
+        method: str,
+        url: str,
+        *,
+        timing: list[float] | None = None,
+        **kwargs: Any,
     ) -> dict | list[dict] | int | None:
-        """Make a request."""
-        if "/auth/" not in url and not self._is_access_token_valid():
-            await self.refresh_tokens()
+        """Make a request, retrying transient failures of idempotent requests.
 
-        _LOGGER.debug("Making %s request to %s", method, url)
+        The seconds spent in each attempt, excluding the rate limiter and
+        backoff, are appended to `timing` if given.
+        """
+        if "/auth/" not in url:
+            await self._token_manager.async_ensure_valid()
 
-        async with self._client.request(
-            method, url, headers=self._headers, **kwargs
-        ) as resp:
-            if "application/json" in resp.headers.get("Content-Type", ""):
-                data = await resp.json()
+        key = endpoint_key(method, url)
+        if (breaker := self._circuit_breakers.get(key)) is None:
+            breaker = self._circuit_breakers[key] = CircuitBreaker(key)
+        metrics = self._metrics.endpoint(key)
+
+        host = urlsplit(url).netloc
+        retries = self.max_retries if method == "GET" else 0
+        attempt = 0
+        while True:
+            probe = breaker.before_request()
+            try:
+                if (waited := await self._rate_limiter.acquire(host)) > 0.001:
+                    _LOGGER.debug("Waited %.2fs for rate limit of %s", waited, host)
+                data = await self._send(metrics, method, url, timing, **kwargs)
+            except (ServerError, ClientError, asyncio.TimeoutError) as err:
+                if not isinstance(err, ServerError):
+                    metrics.record_error()
+                retry_after = getattr(err, "retry_after", None)
+                breaker.record_failure(retry_after)
+                delay = backoff(attempt) if retry_after is None else retry_after
+                if attempt >= retries or delay > BACKOFF_MAX:
+                    raise
+                _LOGGER.debug(
+                    "Retrying %s request to %s in %.1fs: %s", method, url, delay, err
+                )
+                attempt += 1
+                await asyncio.sleep(delay)
+            except PlantaError:
+                breaker.record_success()
+                raise
             else:
-                data = {"raw": await resp.text()}
+                breaker.record_success()
+                return data
+            finally:
+                if probe:
+                    breaker.end_probe()
 
-            if "status" not in data:
-                data["status"] = resp.status
+    async def _send(
+        self,
+        metrics: EndpointMetrics,
+        method: str,
+        url: str,
+        timing: list[float] | None = None,
+        **kwargs: Any,
+    ) -> dict | list[dict] | int | None:
+        """Send a single request, recording its metrics."""
+        headers = self._headers
+        if "/auth/" in url:
+            # auth requests are sent without the (possibly expired) access token
+            headers = {k: v for k, v in headers.items() if k != "Authorization"}
+        cache_key = cached = None
+        if method == "GET":
+            cache_key = self._cache.key(url, kwargs.get("params"))
+            if cached := self._cache.get(cache_key):
+                headers = {**headers, **cached.headers}
+
+        _LOGGER.debug("Making %s request to %s", method, url)
+
+        start = time.monotonic()
+        try:
+            async with self._client.request(
+                method, url, headers=headers, timeout=self._timeout, **kwargs
+            ) as resp:
+                body = await resp.read()
+                metrics.record(resp.status, time.monotonic() - start, len(body))
 
-            if resp.status >= 400:
-                message = data.get("message", f"HTTP {resp.status} Error")
-                error_type = data.get("errorType", "unknown")
+                if resp.status == 304 and cached:
+                    _LOGGER.debug("Received 304 response from %s, using cache", url)
+                    return {**cached.data, "status": 304}
 
-                if resp.status == 401 or error_type == "unauthorized":
-                    raise UnauthorizedError(message)
+                if "application/json" in resp.headers.get("Content-Type", ""):
+                    decode_start = time.perf_counter()
+                    data = self._decoder.decode(body)
+                    self._metrics.record_decode(
+                        len(body), time.perf_counter() - decode_start
+                    )
                 else:
-                    raise PlantaError(f"{error_type}: {message}")
+                    data = {"raw": await resp.text()}
+
+                if "status" not in data:
+                    data["status"] = resp.status
+
+                if resp.status >= 400:
+                    message = data.get("message", f"HTTP {resp.status} Error")
+                    error_type = data.get("errorType", "unknown")
+
+                    if resp.status == 401 or error_type == "unauthorized":
+                        raise UnauthorizedError(message)
+                    elif resp.status in RETRY_STATUSES:
+                        raise ServerError(
+                            f"{error_type}: {message}",
+                            parse_retry_after(resp.headers.get("Retry-After"))
+                            if resp.status in (429, 503)
+                            else None,
+                        )
+                    else:
+                        raise PlantaError(f"{error_type}: {message}")
+
+                if cache_key:
+                    etag = resp.headers.get("ETag")
+                    last_modified = resp.headers.get("Last-Modified")
+                    # a 304 response is answered with only the fields in use
+                    self._cache.set(
+                        cache_key,
+                        _compact(data) if etag or last_modified else data,
+                        etag,
+                        last_modified,
+                    )
 
-            _LOGGER.debug("Received %s response from %s", resp.status, url)
-            return data  # type: ignore
+                _LOGGER.debug("Received %s response from %s", resp.status, url)
+                return data  # type: ignore
+        finally:
+            if timing is not None:
+                timing.append(time.monotonic() - start)
@@ -0,0 +1,155 @@
+"""Token management module."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+import time
+from typing import Any, Final, TypeVar
+
+import jwt
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+DEFAULT_REFRESH_MARGIN: Final = 300
+EXPIRY_LEEWAY: Final = 30
+
+# in-flight refreshes, by refresh token
+_REFRESHES: dict[str, asyncio.Future[Any]] = {}
+
+
+async def async_single_flight(
+    refresh_token: str, refresh: Callable[[], Awaitable[_T]]
+) -> _T:
+    """Refresh once for every concurrent caller with the same refresh token.
+
+    Clients of different accounts refresh independently.
+    """
+    if (future := _REFRESHES.get(refresh_token)) is None:
+        future = _REFRESHES[refresh_token] = asyncio.ensure_future(refresh())
+        future.add_done_callback(lambda _: _REFRESHES.pop(refresh_token, None))
+    return await asyncio.shield(future)
+
+
+def get_token_expiry(token: str) -> float | None:
+    """Return the `exp` claim of a token, if any."""
+    claims = jwt.decode(token, options={"verify_signature": False, "verify_exp": False})
+    return float(exp) if (exp := claims.get("exp")) is not None else None
+
+
+class TokenManager:
+    """Track access token expiry and refresh the token ahead of time."""
+
+    def __init__(
+        self,
+        refresh: Callable[[], Awaitable[None]],
+        *,
+        margin: float = DEFAULT_REFRESH_MARGIN,
+    ) -> None:
+        """Initialize the token manager.
+
+        Args:
+            refresh (Callable): Coroutine function that refreshes the tokens.
+            margin (float): Seconds before expiry to refresh the access token. Defaults to 300.
+        """
+        self._refresh = refresh
+        self.margin = margin
+        self._has_token = False
+        self._expires_at: float | None = None
+        self._refresh_task: asyncio.Task[None] | None = None
+        self._timer: asyncio.TimerHandle | None = None
+        self._refresh_at: float | None = None
+
+    @property
+    def expires_at(self) -> float | None:
+        """Return when the access token expires, as a timestamp."""
+        return self._expires_at
+
+    @property
+    def refresh_at(self) -> float | None:
+        """Return when the next background refresh is scheduled, as a timestamp."""
+        return self._refresh_at
+
+    @property
+    def is_refreshing(self) -> bool:
+        """Return `True` if a refresh is in flight."""
+        return self._refresh_task is not None and not self._refresh_task.done()
+
+    def is_valid(self) -> bool:
+        """Return `True` if the access token is still valid."""
+        if not self._has_token:
+            return False
+        if self._expires_at is None:
+            return True
+        return time.time() < self._expires_at - EXPIRY_LEEWAY
+
+    def set_access_token(self, token: str | None) -> None:
+        """Set the access token, caching its expiry and scheduling a refresh."""
+        self._has_token = bool(token)
+        self._expires_at = get_token_expiry(token) if token else None
+        self._schedule()
+
+    async def async_ensure_valid(self) -> None:
+        """Wait for any in-flight refresh, refreshing first if the token expired."""
+        if self.is_refreshing:
+            await asyncio.shield(self._refresh_task)
+        elif not self.is_valid():
+            await self.async_refresh()
+        elif self._timer is None:
+            self._schedule()
+
+    async def async_refresh(self) -> None:
+        """Refresh the tokens, sharing the result with any concurrent callers."""
+        if not self.is_refreshing:
+            self._refresh_task = asyncio.ensure_future(self._refresh())
+        await asyncio.shield(self._refresh_task)
+
+    def cancel(self) -> None:
+        """Cancel any scheduled or in-flight refresh."""
+        self._cancel_timer()
+        if self.is_refreshing:
+            self._refresh_task.cancel()
+        self._refresh_task = None
+
+    def _schedule(self) -> None:
+        """Schedule a background refresh ahead of the token expiry."""
+        self._cancel_timer()
+        if self._expires_at is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # no loop yet, scheduled on the next request instead
+            return
+        if (remaining := self._expires_at - time.time()) <= 0:
+            return
+        # never wait less than half the remaining lifetime so short-lived tokens
+        # don't end up in a refresh loop
+        delay = max(remaining - self.margin, remaining / 2)
+        self._refresh_at = time.time() + delay
+        self._timer = loop.call_later(delay, self._async_background_refresh)
+
+    def _cancel_timer(self) -> None:
+        """Cancel the scheduled refresh, if any."""
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        self._refresh_at = None
+
+    def _async_background_refresh(self) -> None:
+        """Start a background refresh."""
+        self._timer = self._refresh_at = None
+        if self.is_refreshing:
+            return
+        _LOGGER.debug("Refreshing access token ahead of expiry")
+        self._refresh_task = task = asyncio.ensure_future(self._refresh())
+        task.add_done_callback(self._log_background_refresh_error)
+
+    @staticmethod
+    def _log_background_refresh_error(task: asyncio.Task[None]) -> None:
+        """Log a failed background refresh."""
+        if not task.cancelled() and (ex := task.exception()):
+            _LOGGER.warning("Background token refresh failed: %s", ex)
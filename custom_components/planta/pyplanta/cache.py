@@ -0,0 +1,74 @@
+"""Conditional request cache module."""
+
+from __future__ import annotations
+
+from typing import Any, Final, NamedTuple
+
+# responses kept, evicting the least recently used
+DEFAULT_MAX_ENTRIES: Final = 1000
+
+
+class CachedResponse(NamedTuple):
+    """A cached response and its validators."""
+
+    etag: str | None
+    last_modified: str | None
+    data: dict[str, Any]
+
+    @property
+    def headers(self) -> dict[str, str]:
+        """Return the conditional request headers for this response."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """Cache of parsed GET responses keyed by url and params."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_entries (int): The number of responses kept. Defaults to 1000.
+        """
+        self.max_entries = max_entries
+        self._entries: dict[str, CachedResponse] = {}
+
+    @staticmethod
+    def key(url: str, params: dict[str, Any] | None = None) -> str:
+        """Return the cache key for a url and params."""
+        if not params:
+            return url
+        return f"{url}?{'&'.join(f'{k}={v}' for k, v in sorted(params.items()))}"
+
+    def get(self, key: str) -> CachedResponse | None:
+        """Return the cached response for a key, if any."""
+        if (cached := self._entries.pop(key, None)) is not None:
+            self._entries[key] = cached
+        return cached
+
+    def set(
+        self,
+        key: str,
+        data: dict[str, Any],
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        """Cache a response if it has a validator, otherwise evict it."""
+        self._entries.pop(key, None)
+        if etag or last_modified:
+            self._entries[key] = CachedResponse(etag, last_modified, data)
+            while len(self._entries) > self.max_entries:
+                del self._entries[next(iter(self._entries))]
+
+    def clear(self) -> None:
+        """Clear the cache."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        """Return the number of cached responses."""
+        return len(self._entries)
@@ -0,0 +1,39 @@
+"""JSON decoding module."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # falls back to the standard library
+    orjson = None
+
+
+def json_loads(body: bytes) -> Any:
+    """Decode JSON with orjson, if available."""
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+class JSONDecoder:
+    """Decode JSON bodies in the event loop.
+
+    Decoding holds the GIL, so an executor thread doesn't keep the event loop
+    from stalling and only adds the hand-off, see `scripts/bench/decode.py`.
+    """
+
+    def __init__(self, loads: Callable[[bytes], Any] = json_loads) -> None:
+        """Initialize the decoder.
+
+        Args:
+            loads (Callable): Function that decodes a body. Defaults to orjson, if available.
+        """
+        self.loads = loads
+
+    def decode(self, body: bytes) -> Any:
+        """Decode a body."""
+        return self.loads(body)
@@ -7,3 +7,21 @@ class PlantaError(Exception):
 
 class UnauthorizedError(PlantaError):
     """Unauthorized error."""
+
+
+class ServerError(PlantaError):
+    """Transient server error."""
+
+    def __init__(self, message: str, retry_after: float | None = None) -> None:
+        """Initialize the error."""
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(PlantaError):
+    """Circuit open error."""
+
+    def __init__(self, message: str, retry_in: float) -> None:
+        """Initialize the error."""
+        super().__init__(message)
+        self.retry_in = retry_in
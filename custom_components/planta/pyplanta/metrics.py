@@ -0,0 +1,160 @@
+"""Request metrics module."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import Counter
+from typing import Any, Final
+
+# seconds
+LATENCY_BUCKETS: Final = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PAGE_BUCKETS: Final = (1, 2, 3, 5, 10, 20)
+DECODE_BUCKETS: Final = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25)
+
+
+class Histogram:
+    """Histogram of observed values, with fixed bucket upper bounds."""
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        """Initialize the histogram."""
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.last: float | None = None
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean of the observed values."""
+        return self.sum / self.count if self.count else None
+
+    def observe(self, value: float) -> None:
+        """Observe a value."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.last = value
+
+    def quantile(self, q: float) -> float | None:
+        """Return the upper bound of the bucket containing a quantile."""
+        if not self.count:
+            return None
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts, strict=False):
+            if (seen := seen + count) >= q * self.count:
+                return bound
+        return float("inf")
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram as a dictionary."""
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 3),
+            "last": self.last,
+            "buckets": {
+                **{
+                    f"le_{bound:g}": count
+                    for bound, count in zip(self.buckets, self.counts, strict=False)
+                },
+                "le_inf": self.counts[-1],
+            },
+        }
+
+
+class EndpointMetrics:
+    """Metrics of the requests to an endpoint."""
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.requests = 0
+        self.statuses: Counter[str] = Counter()
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.bytes_received = 0
+
+    def record(self, status: int, latency: float, size: int) -> None:
+        """Record a response."""
+        self.requests += 1
+        self.statuses[f"{status // 100}xx"] += 1
+        self.latency.observe(latency)
+        self.bytes_received += size
+
+    def record_error(self) -> None:
+        """Record a request that failed without a response."""
+        self.requests += 1
+        self.statuses["error"] += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics as a dictionary."""
+        return {
+            "requests": self.requests,
+            "statuses": dict(self.statuses),
+            "latency": self.latency.as_dict(),
+            "bytes_received": self.bytes_received,
+        }
+
+
+class Metrics:
+    """Metrics of a client."""
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.endpoints: dict[str, EndpointMetrics] = {}
+        self.pages = Histogram(PAGE_BUCKETS)
+        self.token_refreshes = 0
+        self.decode_time = Histogram(DECODE_BUCKETS)
+        self.bytes_decoded = 0
+
+    @property
+    def requests(self) -> int:
+        """Return the total number of requests."""
+        return sum(endpoint.requests for endpoint in self.endpoints.values())
+
+    @property
+    def bytes_received(self) -> int:
+        """Return the total number of bytes received."""
+        return sum(endpoint.bytes_received for endpoint in self.endpoints.values())
+
+    @property
+    def statuses(self) -> Counter[str]:
+        """Return the number of responses in each status bucket."""
+        return sum(
+            (endpoint.statuses for endpoint in self.endpoints.values()), Counter()
+        )
+
+    @property
+    def latency(self) -> Histogram:
+        """Return the latency histogram of every endpoint combined."""
+        histogram = Histogram(LATENCY_BUCKETS)
+        for endpoint in self.endpoints.values():
+            histogram.counts = [
+                a + b
+                for a, b in zip(histogram.counts, endpoint.latency.counts, strict=True)
+            ]
+            histogram.count += endpoint.latency.count
+            histogram.sum += endpoint.latency.sum
+        return histogram
+
+    def record_decode(self, size: int, duration: float) -> None:
+        """Record decoding a JSON body."""
+        self.decode_time.observe(duration)
+        self.bytes_decoded += size
+
+    def endpoint(self, key: str) -> EndpointMetrics:
+        """Return the metrics of an endpoint."""
+        if (metrics := self.endpoints.get(key)) is None:
+            metrics = self.endpoints[key] = EndpointMetrics()
+        return metrics
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics as a dictionary."""
+        return {
+            "endpoints": {
+                key: endpoint.as_dict() for key, endpoint in self.endpoints.items()
+            },
+            "pages": self.pages.as_dict(),
+            "token_refreshes": self.token_refreshes,
+            "decode": {
+                "time": self.decode_time.as_dict(),
+                "bytes": self.bytes_decoded,
+            },
+        }
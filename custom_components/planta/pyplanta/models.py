@@ -0,0 +1,308 @@
+"""Planta models."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from datetime import datetime
+import sys
+from typing import Any, Final
+
+# API action type -> PlantActions attribute
+ACTION_TYPES: Final = {
+    "cleaning": "cleaning",
+    "fertilizing": "fertilizing",
+    "misting": "misting",
+    "progressUpdate": "progress_update",
+    "repotting": "repotting",
+    "watering": "watering",
+}
+
+# the API data used by the models: `True` keeps a value as is, `intern` keeps
+# and interns a repeated string, and a dict keeps only the fields it lists
+PLANT_FIELDS: Final[dict[str, Any]] = {
+    "id": True,
+    "names": {
+        "custom": True,
+        "localizedName": sys.intern,
+        "scientific": sys.intern,
+        "variety": sys.intern,
+    },
+    "site": {"name": sys.intern},
+    "health": sys.intern,
+    "size": True,
+    "environment": {"pot": {"size": True, "soil": sys.intern, "type": sys.intern}},
+    "actions": True,
+    "plantCare": {"customFertilizing": True, "customWatering": True},
+    "image": {"url": True, "lastUpdated": True},
+}
+
+
+def project(data: dict[str, Any], fields: dict[str, Any] = PLANT_FIELDS) -> dict:
+    """Return only the fields of the API data that are used, interning strings."""
+    projected = {}
+    for key, field in fields.items():
+        if (value := data.get(key)) is None:
+            continue
+        if isinstance(field, dict):
+            if isinstance(value, dict):
+                projected[key] = project(value, field)
+        elif field is sys.intern and isinstance(value, str):
+            projected[key] = sys.intern(value)
+        else:
+            projected[key] = value
+    return projected
+
+
+def parse_datetime(value: str | None) -> datetime | None:
+    """Parse an ISO 8601 date, if any."""
+    return datetime.fromisoformat(value) if value else None
+
+
+class ActionRecord:
+    """A scheduled or completed plant action."""
+
+    __slots__ = ("date", "type")
+
+    def __init__(self, date: datetime | None, type: str | None = None) -> None:
+        """Initialize the record."""
+        self.date = date
+        self.type = type
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any] | None) -> ActionRecord | None:
+        """Create a record from API data."""
+        if not data:
+            return None
+        return cls(parse_datetime(data.get("date")), data.get("type"))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the record as a dictionary."""
+        return {
+            "date": self.date.isoformat() if self.date else None,
+            "type": self.type,
+        }
+
+
+class PlantAction:
+    """The next and last completed record of a plant action."""
+
+    __slots__ = ("completed", "next")
+
+    def __init__(
+        self, next: ActionRecord | None, completed: ActionRecord | None
+    ) -> None:
+        """Initialize the action."""
+        self.next = next
+        self.completed = completed
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any] | None) -> PlantAction | None:
+        """Create an action from API data."""
+        if not data:
+            return None
+        return cls(
+            ActionRecord.from_dict(data.get("next")),
+            ActionRecord.from_dict(data.get("completed")),
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the action as a dictionary."""
+        return {
+            "next": self.next.as_dict() if self.next else None,
+            "completed": self.completed.as_dict() if self.completed else None,
+        }
+
+
+class PlantActions:
+    """The actions of a plant."""
+
+    __slots__ = tuple(ACTION_TYPES.values())
+
+    def __init__(self, **actions: PlantAction | None) -> None:
+        """Initialize the actions."""
+        for attr in self.__slots__:
+            setattr(self, attr, actions.get(attr))
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any] | None) -> PlantActions:
+        """Create the actions from API data."""
+        data = data or {}
+        return cls(
+            **{
+                attr: PlantAction.from_dict(data.get(action_type))
+                for action_type, attr in ACTION_TYPES.items()
+            }
+        )
+
+    def get(self, action_type: str) -> PlantAction | None:
+        """Return an action by its API action type."""
+        if attr := ACTION_TYPES.get(action_type):
+            return getattr(self, attr)
+        return None
+
+    def items(self) -> Iterator[tuple[str, PlantAction]]:
+        """Iterate over the API action types and actions that are set."""
+        for action_type, attr in ACTION_TYPES.items():
+            if (action := getattr(self, attr)) is not None:
+                yield action_type, action
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the actions as a dictionary."""
+        return {action_type: action.as_dict() for action_type, action in self.items()}
+
+
+class Pot:
+    """The pot of a plant."""
+
+    __slots__ = ("size", "soil", "type")
+
+    def __init__(
+        self,
+        size: float | None = None,
+        soil: str | None = None,
+        type: str | None = None,
+    ) -> None:
+        """Initialize the pot."""
+        self.size = size
+        self.soil = soil
+        self.type = type
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any] | None) -> Pot:
+        """Create a pot from API data."""
+        data = data or {}
+        return cls(data.get("size"), data.get("soil"), data.get("type"))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the pot as a dictionary."""
+        return {"size": self.size, "soil": self.soil, "type": self.type}
+
+
+class PlantCare:
+    """The custom care schedules of a plant."""
+
+    __slots__ = ("custom_fertilizing", "custom_watering")
+
+    def __init__(
+        self,
+        custom_fertilizing: dict[str, Any] | None = None,
+        custom_watering: dict[str, Any] | None = None,
+    ) -> None:
+        """Initialize the plant care."""
+        self.custom_fertilizing = custom_fertilizing
+        self.custom_watering = custom_watering
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any] | None) -> PlantCare:
+        """Create the plant care from API data."""
+        data = data or {}
+        return cls(data.get("customFertilizing"), data.get("customWatering"))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the plant care as a dictionary."""
+        return {
+            "customFertilizing": self.custom_fertilizing,
+            "customWatering": self.custom_watering,
+        }
+
+
+class Plant:
+    """A Planta plant."""
+
+    __slots__ = (
+        "actions",
+        "custom_name",
+        "health",
+        "id",
+        "image_last_updated",
+        "image_url",
+        "localized_name",
+        "plant_care",
+        "pot",
+        "scientific_name",
+        "site_name",
+        "size",
+        "variety",
+    )
+
+    def __init__(
+        self,
+        id: str,
+        *,
+        custom_name: str | None = None,
+        localized_name: str | None = None,
+        scientific_name: str | None = None,
+        variety: str | None = None,
+        site_name: str | None = None,
+        health: str | None = None,
+        size: float | None = None,
+        pot: Pot | None = None,
+        actions: PlantActions | None = None,
+        plant_care: PlantCare | None = None,
+        image_url: str | None = None,
+        image_last_updated: datetime | None = None,
+    ) -> None:
+        """Initialize the plant."""
+        self.id = id
+        self.custom_name = custom_name
+        self.localized_name = localized_name
+        self.scientific_name = scientific_name
+        self.variety = variety
+        self.site_name = site_name
+        self.health = health
+        self.size = size
+        self.pot = pot or Pot()
+        self.actions = actions or PlantActions()
+        self.plant_care = plant_care or PlantCare()
+        self.image_url = image_url
+        self.image_last_updated = image_last_updated
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Plant:
+        """Create a plant from API data."""
+        names = data.get("names") or {}
+        image = data.get("image") or {}
+        return cls(
+            data["id"],
+            custom_name=names.get("custom"),
+            localized_name=names.get("localizedName"),
+            scientific_name=names.get("scientific"),
+            variety=names.get("variety"),
+            site_name=(data.get("site") or {}).get("name"),
+            health=data.get("health"),
+            size=data.get("size"),
+            pot=Pot.from_dict((data.get("environment") or {}).get("pot")),
+            actions=PlantActions.from_dict(data.get("actions")),
+            plant_care=PlantCare.from_dict(data.get("plantCare")),
+            image_url=image.get("url"),
+            image_last_updated=parse_datetime(image.get("lastUpdated")),
+        )
+
+    @property
+    def name(self) -> str | None:
+        """Return the custom name, falling back to the localized name."""
+        return self.custom_name or self.localized_name
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the plant as a dictionary in the shape of the API data."""
+        return {
+            "id": self.id,
+            "names": {
+                "custom": self.custom_name,
+                "localizedName": self.localized_name,
+                "scientific": self.scientific_name,
+                "variety": self.variety,
+            },
+            "site": {"name": self.site_name},
+            "health": self.health,
+            "size": self.size,
+            "environment": {"pot": self.pot.as_dict()},
+            "actions": self.actions.as_dict(),
+            "plantCare": self.plant_care.as_dict(),
+            "image": {
+                "url": self.image_url,
+                "lastUpdated": self.image_last_updated.isoformat()
+                if self.image_last_updated
+                else None,
+            },
+        }
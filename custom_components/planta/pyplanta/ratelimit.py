@@ -0,0 +1,109 @@
+"""Rate limiting module."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Final
+from weakref import WeakKeyDictionary
+
+from aiohttp import ClientSession
+
+# a full sync of 10,000 plants (100 pages) waits about 8 seconds, and targeted
+# refreshes of up to 20 plants aren't held back
+DEFAULT_RATE: Final = 10.0
+DEFAULT_CAPACITY: Final = 20
+
+_LIMITERS: WeakKeyDictionary[ClientSession, RateLimiter] = WeakKeyDictionary()
+
+
+def get_rate_limiter(session: ClientSession) -> RateLimiter:
+    """Return the rate limiter shared by every client of a session."""
+    if (limiter := _LIMITERS.get(session)) is None:
+        limiter = _LIMITERS[session] = RateLimiter()
+    return limiter
+
+
+class TokenBucket:
+    """Token bucket that makes callers wait for a token, first come first served."""
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        """Initialize the bucket.
+
+        Args:
+            rate (float): Tokens added per second.
+            capacity (int): Maximum number of tokens, which is the allowed burst.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.requests = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    async def acquire(self) -> float:
+        """Take a token, returning the seconds spent waiting for it."""
+        start = time.monotonic()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self._tokens + (now - self._updated) * self.rate, self.capacity
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    break
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+        waited = time.monotonic() - start
+        self.requests += 1
+        if waited > 0.001:
+            self.throttled += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+        return waited
+
+    def as_dict(self) -> dict[str, int | float]:
+        """Return the bucket statistics as a dictionary."""
+        return {
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "total_wait": round(self.total_wait, 3),
+            "max_wait": round(self.max_wait, 3),
+        }
+
+
+class RateLimiter:
+    """Per host token buckets."""
+
+    def __init__(
+        self, rate: float = DEFAULT_RATE, capacity: int = DEFAULT_CAPACITY
+    ) -> None:
+        """Initialize the rate limiter.
+
+        Args:
+            rate (float): Requests per second allowed to each host. Defaults to 10.
+            capacity (int): Requests allowed in a burst to each host. Defaults to 20.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._buckets: dict[str, TokenBucket] = {}
+
+    @property
+    def buckets(self) -> dict[str, TokenBucket]:
+        """Return the token buckets, by host."""
+        return self._buckets
+
+    async def acquire(self, host: str) -> float:
+        """Wait for a request to a host, returning the seconds spent waiting."""
+        if (bucket := self._buckets.get(host)) is None:
+            bucket = self._buckets[host] = TokenBucket(self.rate, self.capacity)
+        return await bucket.acquire()
+
+    def as_dict(self) -> dict[str, dict[str, int | float]]:
+        """Return the statistics of each host as a dictionary."""
+        return {host: bucket.as_dict() for host, bucket in self._buckets.items()}
@@ -0,0 +1,141 @@
+"""Retry and circuit breaker module."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from enum import StrEnum
+import random
+import re
+import time
+from typing import Final
+from urllib.parse import urlsplit
+
+from .exceptions import CircuitOpenError
+
+MAX_RETRIES: Final = 3
+BACKOFF_BASE: Final = 0.5
+BACKOFF_MAX: Final = 8.0
+
+FAILURE_THRESHOLD: Final = 5
+RESET_TIMEOUT: Final = 60.0
+
+RETRY_STATUSES: Final = frozenset({429, 500, 502, 503, 504})
+
+_PLANT_ID = re.compile(r"/addedPlants/[^/?]+")
+
+
+def endpoint_key(method: str, url: str) -> str:
+    """Return the endpoint of a request, with plant ids replaced."""
+    return f"{method} {_PLANT_ID.sub('/addedPlants/{id}', urlsplit(url).path)}"
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a `Retry-After` header into seconds."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max((date - datetime.now(timezone.utc)).total_seconds(), 0)
+
+
+def backoff(attempt: int) -> float:
+    """Return the delay before a retry, using exponential backoff with full jitter."""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2**attempt))
+
+
+class CircuitState(StrEnum):
+    """Circuit breaker state."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Fail fast while an endpoint is down, probing it again after a timeout."""
+
+    def __init__(
+        self,
+        endpoint: str,
+        *,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        reset_timeout: float = RESET_TIMEOUT,
+    ) -> None:
+        """Initialize the circuit breaker."""
+        self.endpoint = endpoint
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._opened_until = 0.0
+        self._probing = False
+
+    @property
+    def state(self) -> CircuitState:
+        """Return the state of the circuit."""
+        if self.failures < self.failure_threshold:
+            return CircuitState.CLOSED
+        if time.monotonic() < self._opened_until:
+            return CircuitState.OPEN
+        return CircuitState.HALF_OPEN
+
+    @property
+    def retry_in(self) -> float:
+        """Return the seconds until the circuit allows a probe."""
+        return max(self._opened_until - time.monotonic(), 0)
+
+    def before_request(self) -> bool:
+        """Raise if the circuit is open or a half-open probe is in flight.
+
+        Returns `True` if the request is the half-open probe, which must be
+        ended with `end_probe` once it is done.
+        """
+        state = self.state
+        if state is CircuitState.OPEN or (
+            state is CircuitState.HALF_OPEN and self._probing
+        ):
+            raise CircuitOpenError(
+                f"{self.endpoint} is unavailable, retrying in {self.retry_in:.0f}s",
+                self.retry_in,
+            )
+        self._probing = state is CircuitState.HALF_OPEN
+        return self._probing
+
+    def end_probe(self) -> None:
+        """Allow another probe, however the request ended.
+
+        A probe that is cancelled or raises something unexpected records
+        neither a success nor a failure, and would otherwise block every later
+        request.
+        """
+        self._probing = False
+
+    def record_success(self) -> None:
+        """Close the circuit."""
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self, retry_after: float | None = None) -> None:
+        """Record a failure, opening the circuit at the threshold."""
+        self.failures += 1
+        self._probing = False
+        if retry_after is not None:
+            # the server told us when to come back
+            self.failures = max(self.failures, self.failure_threshold)
+            self._opened_until = time.monotonic() + retry_after
+        elif self.failures >= self.failure_threshold:
+            self._opened_until = time.monotonic() + self.reset_timeout
+
+    def as_dict(self) -> dict[str, str | int | float]:
+        """Return the circuit breaker state as a dictionary."""
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "retry_in": round(self.retry_in, 1),
+        }
@@ -0,0 +1,214 @@
+"""Planta schedule indexes."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+from itertools import islice
+from operator import attrgetter, itemgetter
+from typing import NamedTuple
+
+from .pyplanta.models import Plant
+
+type DueEntry = tuple[datetime, str]
+
+_date = itemgetter(0)
+_start = attrgetter("start")
+
+
+class SortedDates:
+    """Plant ids sorted by the date an action is due."""
+
+    __slots__ = ("entries",)
+
+    def __init__(self) -> None:
+        """Initialize the dates."""
+        self.entries: list[DueEntry] = []
+
+    def __len__(self) -> int:
+        """Return the number of entries."""
+        return len(self.entries)
+
+    def add(self, date: datetime, plant_id: str) -> None:
+        """Add the date of a plant."""
+        insort(self.entries, (date, plant_id))
+
+    def remove(self, date: datetime, plant_id: str) -> None:
+        """Remove the date of a plant."""
+        index = bisect_left(self.entries, (date, plant_id))
+        if index < len(self.entries) and self.entries[index] == (date, plant_id):
+            del self.entries[index]
+
+    def before(self, date: datetime) -> list[DueEntry]:
+        """Return the entries due before a date."""
+        return self.entries[: bisect_left(self.entries, date, key=_date)]
+
+    def first(self, date: datetime, strict: bool = False) -> list[DueEntry]:
+        """Return the entries on the earliest due date at, or if strict after, a date."""
+        start = (bisect_right if strict else bisect_left)(self.entries, date, key=_date)
+        if start == len(self.entries):
+            return []
+        end = bisect_right(self.entries, self.entries[start][0], lo=start, key=_date)
+        return self.entries[start:end]
+
+
+class DueIndex:
+    """The next due date of every plant action, by action type and by site.
+
+    Plants are updated individually, so a refresh only touches the plants that
+    changed, and querying the plants due before a date takes a binary search.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the index."""
+        # plant id -> site name and next date by action type
+        self._plants: dict[str, tuple[str | None, dict[str, datetime]]] = {}
+        # (site name or None for every plant, action type) -> dates
+        self._dates: dict[tuple[str | None, str], SortedDates] = {}
+        self._sites: Counter[str] = Counter()
+
+    def __len__(self) -> int:
+        """Return the number of plants indexed."""
+        return len(self._plants)
+
+    @property
+    def sites(self) -> set[str]:
+        """Return the names of the sites with plants."""
+        return set(self._sites)
+
+    def dates(self, action_type: str, site: str | None = None) -> SortedDates:
+        """Return the dates of an action type, optionally only of a site."""
+        return self._dates.get((site, action_type)) or SortedDates()
+
+    def rebuild(self, plants: dict[str, Plant]) -> None:
+        """Index every plant."""
+        self._plants.clear()
+        self._dates.clear()
+        self._sites.clear()
+        for plant_id, plant in plants.items():
+            self.update(plant_id, plant)
+
+    def update(self, plant_id: str, plant: Plant | None) -> None:
+        """Index a plant again, or remove it from the index if `None`."""
+        if previous := self._plants.pop(plant_id, None):
+            site, dates = previous
+            for action_type, date in dates.items():
+                self._dates[(None, action_type)].remove(date, plant_id)
+                if site is not None:
+                    self._dates[(site, action_type)].remove(date, plant_id)
+            if site is not None:
+                self._sites[site] -= 1
+                if not self._sites[site]:
+                    del self._sites[site]
+        if plant is None:
+            return
+        site = plant.site_name
+        dates = {
+            action_type: action.next.date
+            for action_type, action in plant.actions.items()
+            if action.next and action.next.date
+        }
+        self._plants[plant_id] = (site, dates)
+        for action_type, date in dates.items():
+            self._dates.setdefault((None, action_type), SortedDates()).add(
+                date, plant_id
+            )
+            if site is not None:
+                self._dates.setdefault((site, action_type), SortedDates()).add(
+                    date, plant_id
+                )
+        if site is not None:
+            self._sites[site] += 1
+
+    def next_due(
+        self, after: datetime
+    ) -> tuple[datetime, list[tuple[str, str]]] | None:
+        """Return the earliest due date after a date, with the plant ids and action types due then."""
+        due: datetime | None = None
+        actions: list[tuple[str, str]] = []
+        for (site, action_type), dates in self._dates.items():
+            if site is not None or not (entries := dates.first(after, strict=True)):
+                continue
+            date = entries[0][0]
+            if due is None or date < due:
+                due, actions = date, []
+            elif date > due:
+                continue
+            actions.extend((plant_id, action_type) for _, plant_id in entries)
+        return None if due is None else (due, actions)
+
+
+class Interval(NamedTuple):
+    """A completed or upcoming plant action, over an interval of time."""
+
+    start: datetime
+    end: datetime
+    plant_id: str
+    action_type: str
+    completed: bool
+
+
+class IntervalIndex:
+    """Plant action intervals sorted by start.
+
+    Intervals overlapping a range start before its end and at most the longest
+    interval before its start, so a range query is a binary search followed by
+    a scan of only the intervals it returns. Plants are updated individually.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the index."""
+        self._intervals: list[Interval] = []
+        self._plants: dict[str, list[Interval]] = {}
+        # never shrinks, which only widens the range scanned
+        self._max_length = timedelta(0)
+
+    def __len__(self) -> int:
+        """Return the number of intervals."""
+        return len(self._intervals)
+
+    def rebuild(self, intervals: dict[str, list[Interval]]) -> None:
+        """Index the intervals of every plant."""
+        self._plants = intervals
+        self._intervals = sorted(
+            interval for plant in intervals.values() for interval in plant
+        )
+        self._max_length = max(
+            (interval.end - interval.start for interval in self._intervals),
+            default=timedelta(0),
+        )
+
+    def update(self, plant_id: str, intervals: Iterable[Interval]) -> None:
+        """Index the intervals of a plant again, removing the plant if there are none."""
+        for interval in self._plants.pop(plant_id, ()):
+            index = bisect_left(self._intervals, interval)
+            if index < len(self._intervals) and self._intervals[index] == interval:
+                del self._intervals[index]
+        if not (intervals := list(intervals)):
+            return
+        self._plants[plant_id] = intervals
+        for interval in intervals:
+            insort(self._intervals, interval)
+            self._max_length = max(self._max_length, interval.end - interval.start)
+
+    def overlapping(self, start: datetime, end: datetime) -> list[Interval]:
+        """Return the intervals overlapping a range, sorted by start."""
+        low = bisect_left(self._intervals, start - self._max_length, key=_start)
+        high = bisect_left(self._intervals, end, lo=low, key=_start)
+        return [
+            interval for interval in self._intervals[low:high] if interval.end > start
+        ]
+
+    def upcoming(self, date: datetime) -> Interval | None:
+        """Return the first interval that hasn't ended at a date."""
+        low = bisect_left(self._intervals, date - self._max_length, key=_start)
+        return next(
+            (
+                interval
+                for interval in islice(self._intervals, low, None)
+                if interval.end > date
+            ),
+            None,
+        )
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from collections.abc import Callable
 from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timedelta
 import logging
 from typing import Any
 
@@ -16,60 +16,56 @@ from homeassistant.components.sensor import (
     SensorEntityDescription,
     SensorStateClass,
 )
-from homeassistant.const import EntityCategory, UnitOfLength, UnitOfTime
-from homeassistant.core import HomeAssistant
+from homeassistant.const import (
+    EntityCategory,
+    UnitOfInformation,
+    UnitOfLength,
+    UnitOfTime,
+)
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import dt as dt_util
+from homeassistant.util.unit_conversion import DurationConverter
 
 from .coordinator import PlantaConfigEntry, PlantaCoordinator
-from .entity import PlantaEntity
+from .entity import PlantaEntity, PlantaHubEntity
+from .pyplanta.models import ACTION_TYPES, Plant
+from .schedule import DueEntry, SortedDates
 
 _LOGGER = logging.getLogger(__name__)
 
 PLANT_HEALTH_LIST = ["notset", "poor", "fair", "good", "verygood", "excellent"]
 
 
-def get_last_watering_completed(
-    plant: dict[str, Any], time_since: bool = False
-) -> float | None:
+def get_last_watering_completed(plant: Plant) -> datetime | None:
     """Get the last watering (or liquid fertilizing) completed."""
-    actions = plant.get("actions", {})
-    action_date = max(
+    return max(
         (
-            datetime.fromisoformat(record["date"])
+            record.date
             for action_type in ("watering", "fertilizing")
-            if (action := actions.get(action_type))
-            and (record := action.get("completed"))
-            and "date" in record
-            and (action_type != "fertilizing" or record.get("type") == "liquid")
+            if (action := plant.actions.get(action_type))
+            and (record := action.completed)
+            and record.date
+            and (action_type != "fertilizing" or record.type == "liquid")
         ),
         default=None,
     )
-    if time_since and action_date:
-        return (datetime.now(timezone.utc) - action_date).total_seconds()
-    return action_date
 
 
 def get_plant_action_date(
-    plant: dict[str, Any], action_type: str, completed: bool = False
+    plant: Plant, action_type: str, completed: bool = False
 ) -> datetime | None:
     """Get plant action date."""
-    action = plant["actions"].get(action_type, {})
-    if record := action.get("completed" if completed else "next"):
-        return datetime.fromisoformat(record["date"])
-    return None
-
-
-def time_since_last_completed(plant: dict[str, Any], action_type: str) -> float | None:
-    """Get time since last completed action."""
-    if action_date := get_plant_action_date(plant, action_type, True):
-        return (datetime.now(timezone.utc) - action_date).total_seconds()
+    if (action := plant.actions.get(action_type)) and (
+        record := action.completed if completed else action.next
+    ):
+        return record.date
     return None
 
 
-def custom_schedule(plant: dict[str, Any], schedule_type: str) -> dict[str, Any] | None:
+def custom_schedule(plant: Plant, schedule_type: str) -> dict[str, Any] | None:
     """Return custom schedule, if any."""
-    if (schedule := plant["plantCare"].get(schedule_type, {})).get("enabled"):
+    if (schedule := getattr(plant.plant_care, schedule_type) or {}).get("enabled"):
         return {
             snakecase(key if key != "enabled" else "custom_schedule"): value
             for key, value in schedule.items()
@@ -81,57 +77,55 @@ def custom_schedule(plant: dict[str, Any], schedule_type: str) -> dict[str, Any]
 class PlantaSensorEntityDescription(SensorEntityDescription):
     """Planta sensor entity description."""
 
-    field: str
-    is_pot: bool = False
-    value_fn: Callable[[dict[str, Any]], datetime | None] | None = None
-    extra_state_attributes_fn: Callable[[dict[str, Any]], dict[str, Any]] | None = None
+    field: str | None = None
+    value_fn: Callable[[Plant], datetime | float | str | None] | None = None
+    # for duration sensors, the date the time since is measured from
+    since_fn: Callable[[Plant], datetime | None] | None = None
+    extra_state_attributes_fn: Callable[[Plant], dict[str, Any] | None] | None = None
 
 
 PLANT_DESCRIPTORS = (
     PlantaSensorEntityDescription(
         key="health",
-        field="health",
         translation_key="health",
         icon="mdi:clipboard-pulse",
         device_class=SensorDeviceClass.ENUM,
         entity_category=EntityCategory.DIAGNOSTIC,
         options=PLANT_HEALTH_LIST,
+        value_fn=lambda plant: plant.health,
     ),
     PlantaSensorEntityDescription(
         key="size",
-        field="size",
         translation_key="size",
         device_class=SensorDeviceClass.DISTANCE,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:arrow-up-down",
         native_unit_of_measurement=UnitOfLength.CENTIMETERS,
         state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda plant: plant.size,
     ),
     PlantaSensorEntityDescription(
         key="growing_medium",
-        field="soil",
-        is_pot=True,
         translation_key="growing_medium",
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:pot",
+        value_fn=lambda plant: plant.pot.soil,
     ),
     PlantaSensorEntityDescription(
         key="pot_size",
-        field="size",
-        is_pot=True,
         translation_key="pot_size",
         device_class=SensorDeviceClass.DISTANCE,
         entity_category=EntityCategory.DIAGNOSTIC,
         native_unit_of_measurement=UnitOfLength.CENTIMETERS,
         state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda plant: plant.pot.size,
     ),
     PlantaSensorEntityDescription(
         key="pot_type",
-        field="type",
-        is_pot=True,
         translation_key="pot_type",
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:pot-outline",
+        value_fn=lambda plant: plant.pot.type,
     ),
 )
 ACTION_DESCRIPTORS = (
@@ -159,8 +153,9 @@ ACTION_DESCRIPTORS = (
         entity_registry_enabled_default=False,
         native_unit_of_measurement=UnitOfTime.SECONDS,
         suggested_unit_of_measurement=UnitOfTime.DAYS,
+        suggested_display_precision=1,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda plant: time_since_last_completed(plant, "cleaning"),
+        since_fn=lambda plant: get_plant_action_date(plant, "cleaning", True),
     ),
     PlantaSensorEntityDescription(
         key="scheduled_fertilizing",
@@ -169,7 +164,7 @@ ACTION_DESCRIPTORS = (
         device_class=SensorDeviceClass.TIMESTAMP,
         value_fn=lambda plant: get_plant_action_date(plant, "fertilizing"),
         extra_state_attributes_fn=lambda plant: custom_schedule(
-            plant, "customFertilizing"
+            plant, "custom_fertilizing"
         ),
     ),
     PlantaSensorEntityDescription(
@@ -189,8 +184,9 @@ ACTION_DESCRIPTORS = (
         entity_registry_enabled_default=False,
         native_unit_of_measurement=UnitOfTime.SECONDS,
         suggested_unit_of_measurement=UnitOfTime.DAYS,
+        suggested_display_precision=1,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda plant: time_since_last_completed(plant, "fertilizing"),
+        since_fn=lambda plant: get_plant_action_date(plant, "fertilizing", True),
     ),
     PlantaSensorEntityDescription(
         key="scheduled_misting",
@@ -216,8 +212,9 @@ ACTION_DESCRIPTORS = (
         entity_registry_enabled_default=False,
         native_unit_of_measurement=UnitOfTime.SECONDS,
         suggested_unit_of_measurement=UnitOfTime.DAYS,
+        suggested_display_precision=1,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda plant: time_since_last_completed(plant, "misting"),
+        since_fn=lambda plant: get_plant_action_date(plant, "misting", True),
     ),
     PlantaSensorEntityDescription(
         key="scheduled_progress_update",
@@ -243,8 +240,9 @@ ACTION_DESCRIPTORS = (
         entity_registry_enabled_default=False,
         native_unit_of_measurement=UnitOfTime.SECONDS,
         suggested_unit_of_measurement=UnitOfTime.DAYS,
+        suggested_display_precision=1,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda plant: time_since_last_completed(plant, "progressUpdate"),
+        since_fn=lambda plant: get_plant_action_date(plant, "progressUpdate", True),
     ),
     PlantaSensorEntityDescription(
         key="scheduled_repotting",
@@ -270,8 +268,9 @@ ACTION_DESCRIPTORS = (
         entity_registry_enabled_default=False,
         native_unit_of_measurement=UnitOfTime.SECONDS,
         suggested_unit_of_measurement=UnitOfTime.DAYS,
+        suggested_display_precision=1,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda plant: time_since_last_completed(plant, "repotting"),
+        since_fn=lambda plant: get_plant_action_date(plant, "repotting", True),
     ),
     PlantaSensorEntityDescription(
         key="scheduled_watering",
@@ -280,7 +279,7 @@ ACTION_DESCRIPTORS = (
         device_class=SensorDeviceClass.TIMESTAMP,
         value_fn=lambda plant: get_plant_action_date(plant, "watering"),
         extra_state_attributes_fn=lambda plant: custom_schedule(
-            plant, "customWatering"
+            plant, "custom_watering"
         ),
     ),
     PlantaSensorEntityDescription(
@@ -289,7 +288,7 @@ ACTION_DESCRIPTORS = (
         translation_key="last_watering",
         device_class=SensorDeviceClass.TIMESTAMP,
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda plant: get_last_watering_completed(plant),
+        value_fn=get_last_watering_completed,
     ),
     PlantaSensorEntityDescription(
         key="time_since_last_watering",
@@ -300,12 +299,187 @@ ACTION_DESCRIPTORS = (
         entity_registry_enabled_default=False,
         native_unit_of_measurement=UnitOfTime.SECONDS,
         suggested_unit_of_measurement=UnitOfTime.DAYS,
+        suggested_display_precision=1,
+        state_class=SensorStateClass.MEASUREMENT,
+        since_fn=get_last_watering_completed,
+    ),
+)
+
+
+def api_latency_attributes(coordinator: PlantaCoordinator) -> dict[str, Any]:
+    """Return the latency quantiles and histogram of the API requests."""
+    latency = coordinator.client.metrics.latency
+    return {
+        "p50": latency.quantile(0.5),
+        "p95": latency.quantile(0.95),
+        **latency.as_dict()["buckets"],
+    }
+
+
+@dataclass(frozen=True, kw_only=True)
+class PlantaHubSensorEntityDescription(SensorEntityDescription):
+    """Planta hub sensor entity description."""
+
+    value_fn: Callable[[PlantaCoordinator], float | None]
+    extra_state_attributes_fn: (
+        Callable[[PlantaCoordinator], dict[str, Any] | None] | None
+    ) = None
+
+
+HUB_DESCRIPTORS = (
+    PlantaHubSensorEntityDescription(
+        key="api_requests",
+        translation_key="api_requests",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:api",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.client.metrics.requests,
+        extra_state_attributes_fn=lambda coordinator: {
+            "endpoints": {
+                key: endpoint.requests
+                for key, endpoint in coordinator.client.metrics.endpoints.items()
+            },
+            "statuses": dict(coordinator.client.metrics.statuses),
+        },
+    ),
+    PlantaHubSensorEntityDescription(
+        key="api_latency",
+        translation_key="api_latency",
+        device_class=SensorDeviceClass.DURATION,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        suggested_display_precision=0,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: coordinator.client.metrics.latency.mean,
+        extra_state_attributes_fn=api_latency_attributes,
+    ),
+    PlantaHubSensorEntityDescription(
+        key="api_bytes_received",
+        translation_key="api_bytes_received",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        suggested_unit_of_measurement=UnitOfInformation.KIBIBYTES,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.client.metrics.bytes_received,
+    ),
+    PlantaHubSensorEntityDescription(
+        key="pages_per_refresh",
+        translation_key="pages_per_refresh",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        icon="mdi:book-open-page-variant",
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda plant: get_last_watering_completed(plant, True),
+        value_fn=lambda coordinator: coordinator.client.metrics.pages.last,
+        extra_state_attributes_fn=lambda coordinator: (
+            coordinator.client.metrics.pages.as_dict()["buckets"]
+        ),
+    ),
+    PlantaHubSensorEntityDescription(
+        key="token_refreshes",
+        translation_key="token_refreshes",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        icon="mdi:key-change",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.client.metrics.token_refreshes,
+    ),
+    PlantaHubSensorEntityDescription(
+        key="refresh_duration",
+        translation_key="refresh_duration",
+        device_class=SensorDeviceClass.DURATION,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_display_precision=2,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: coordinator.refresh_duration.last,
+        extra_state_attributes_fn=lambda coordinator: {
+            "mean": coordinator.refresh_duration.mean,
+            **coordinator.refresh_duration.as_dict()["buckets"],
+        },
+    ),
+    PlantaHubSensorEntityDescription(
+        key="rate_limit_wait",
+        translation_key="rate_limit_wait",
+        device_class=SensorDeviceClass.DURATION,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_display_precision=1,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: sum(
+            bucket.total_wait
+            for bucket in coordinator.client.rate_limiter.buckets.values()
+        ),
+        extra_state_attributes_fn=lambda coordinator: (
+            coordinator.client.rate_limiter.as_dict()
+        ),
     ),
 )
 
 
+@dataclass(frozen=True, kw_only=True)
+class PlantaDueSensorEntityDescription(SensorEntityDescription):
+    """Planta due sensor entity description."""
+
+    field: str
+    # the entries, of the dates of an action type, the sensor reports at a time
+    entries_fn: Callable[[SortedDates, datetime], list[DueEntry]]
+    value_fn: Callable[[list[DueEntry]], datetime | int | None]
+
+
+def due_today(dates: SortedDates, now: datetime) -> list[DueEntry]:
+    """Return the entries due by the end of the local day, including overdue ones."""
+    return dates.before(
+        dt_util.start_of_local_day(dt_util.as_local(now)) + timedelta(days=1)
+    )
+
+
+def due_descriptors(action_type: str) -> tuple[PlantaDueSensorEntityDescription, ...]:
+    """Return the due sensor descriptions of an action type."""
+    attr = ACTION_TYPES[action_type]
+    return (
+        PlantaDueSensorEntityDescription(
+            key=f"{attr}_due_today",
+            field=action_type,
+            translation_key=f"{attr}_due_today",
+            icon="mdi:calendar-today",
+            entity_registry_enabled_default=action_type == "watering",
+            state_class=SensorStateClass.MEASUREMENT,
+            entries_fn=due_today,
+            value_fn=len,
+        ),
+        PlantaDueSensorEntityDescription(
+            key=f"{attr}_overdue",
+            field=action_type,
+            translation_key=f"{attr}_overdue",
+            icon="mdi:calendar-alert",
+            entity_registry_enabled_default=action_type == "watering",
+            state_class=SensorStateClass.MEASUREMENT,
+            entries_fn=lambda dates, now: dates.before(now),
+            value_fn=len,
+        ),
+        PlantaDueSensorEntityDescription(
+            key=f"next_{attr}",
+            field=action_type,
+            translation_key=f"next_{attr}",
+            device_class=SensorDeviceClass.TIMESTAMP,
+            entity_registry_enabled_default=action_type == "watering",
+            entries_fn=lambda dates, now: dates.first(now),
+            value_fn=lambda entries: entries[0][0] if entries else None,
+        ),
+    )
+
+
+DUE_DESCRIPTORS = tuple(
+    descriptor
+    for action_type in ACTION_TYPES
+    for descriptor in due_descriptors(action_type)
+)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: PlantaConfigEntry,
@@ -313,24 +487,63 @@ async def async_setup_entry(
 ) -> None:
     """Set up Planta sensors using config entry."""
     coordinator: PlantaCoordinator = entry.runtime_data
-    entities = [
-        PlantaSensorEntity(coordinator, descriptor, plant_id)
-        for plant_id in coordinator.data
-        for descriptor in PLANT_DESCRIPTORS
-    ]
-    entities.extend(
-        PlantaSensorEntity(coordinator, descriptor, plant_id)
-        for plant_id, plant in coordinator.data.items()
-        for descriptor in ACTION_DESCRIPTORS
-        if plant["actions"][descriptor.field]["next"]
+
+    @callback
+    def async_add_plants(plant_ids: list[str]) -> None:
+        """Add the sensors of some plants."""
+        entities = []
+        for plant_id in plant_ids:
+            plant = coordinator.data[plant_id]
+            entities.extend(
+                PlantaSensorEntity(coordinator, descriptor, plant_id)
+                for descriptor in PLANT_DESCRIPTORS
+            )
+            entities.extend(
+                PlantaSensorEntity(coordinator, descriptor, plant_id)
+                for descriptor in ACTION_DESCRIPTORS
+                if (action := plant.actions.get(descriptor.field)) and action.next
+            )
+        async_add_entities(entities)
+
+    sites: set[str] = set()
+
+    @callback
+    def async_add_sites() -> None:
+        """Add the due sensors of new sites."""
+        current = coordinator.due_index.sites
+        # sites that were removed are added again if they come back
+        sites.intersection_update(current)
+        if new_sites := current - sites:
+            sites.update(new_sites)
+            async_add_entities(
+                PlantaDueSensorEntity(coordinator, descriptor, site)
+                for site in sorted(new_sites)
+                for descriptor in DUE_DESCRIPTORS
+            )
+
+    async_add_plants(list(coordinator.data))
+    async_add_entities(
+        [
+            *(
+                PlantaHubSensorEntity(coordinator, descriptor)
+                for descriptor in HUB_DESCRIPTORS
+            ),
+            *(
+                PlantaDueSensorEntity(coordinator, descriptor)
+                for descriptor in DUE_DESCRIPTORS
+            ),
+        ]
     )
-    async_add_entities(entities)
+    async_add_sites()
+    entry.async_on_unload(coordinator.async_add_new_plants_listener(async_add_plants))
+    entry.async_on_unload(coordinator.async_add_listener(async_add_sites))
 
 
 class PlantaSensorEntity(PlantaEntity, SensorEntity):
     """Planta sensor entity."""
 
     entity_description: PlantaSensorEntityDescription
+    _displayed_value: float | None = None
 
     @property
     def entity_registry_enabled_default(self) -> bool:
@@ -350,18 +563,12 @@ class PlantaSensorEntity(PlantaEntity, SensorEntity):
     @property
     def native_value(self) -> int | str | datetime | None:
         """Return the value reported by the sensor."""
+        if self.entity_description.since_fn:
+            return self._attr_native_value
         if not self.plant:
             return None
-        if value_fn := self.entity_description.value_fn:
-            return value_fn(self.plant)
-        elif self.entity_description.is_pot:
-            value = self.plant["environment"]["pot"][self.entity_description.field]
-        else:
-            value = self.plant[self.entity_description.field]
-        if value is None:
+        if (value := self.entity_description.value_fn(self.plant)) is None:
             return value
-        if self.device_class == SensorDeviceClass.TIMESTAMP:
-            return datetime.fromisoformat(value)
         if isinstance(value, str):
             value = value.lower()
         if self.device_class == SensorDeviceClass.ENUM and value not in self.options:
@@ -371,13 +578,110 @@ class PlantaSensorEntity(PlantaEntity, SensorEntity):
 
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
-        if self.device_class == SensorDeviceClass.DURATION:
+        if self.entity_description.since_fn:
+            self._async_update_time_since(dt_util.utcnow())
             self.async_on_remove(
-                async_track_time_interval(
-                    self.hass, self._update_entity_state, timedelta(minutes=15)
-                )
+                self.coordinator.async_add_tick_listener(self._async_tick)
             )
 
-    async def _update_entity_state(self, now: datetime | None = None) -> None:
-        """Update the state of the entity."""
-        self._handle_coordinator_update()
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        if self.entity_description.since_fn:
+            self._async_update_time_since(dt_util.utcnow())
+        super()._handle_coordinator_update()
+
+    @callback
+    def _async_tick(self, now: datetime) -> None:
+        """Write the state if the displayed time since changed."""
+        if self._async_update_time_since(now):
+            self.async_write_ha_state()
+
+    @callback
+    def _async_update_time_since(self, now: datetime) -> bool:
+        """Update the time since value, returning `True` if the displayed value changed."""
+        since = self.entity_description.since_fn(self.plant) if self.plant else None
+        self._attr_native_value = (now - since).total_seconds() if since else None
+        displayed = self._displayed_value
+        if self._attr_native_value is not None:
+            self._displayed_value = round(
+                DurationConverter.convert(
+                    self._attr_native_value,
+                    self.entity_description.native_unit_of_measurement,
+                    self.entity_description.suggested_unit_of_measurement,
+                ),
+                self.entity_description.suggested_display_precision,
+            )
+        else:
+            self._displayed_value = None
+        return self._displayed_value != displayed
+
+
+class PlantaHubSensorEntity(PlantaHubEntity, SensorEntity):
+    """Planta hub sensor entity, reporting the account's request metrics."""
+
+    entity_description: PlantaHubSensorEntityDescription
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the value reported by the sensor."""
+        return self.entity_description.value_fn(self.coordinator)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return entity specific state attributes."""
+        if _fn := self.entity_description.extra_state_attributes_fn:
+            return _fn(self.coordinator)
+        return None
+
+    async def async_added_to_hass(self) -> None:
+        """Update the metrics after every refresh."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_metrics_listener(self.async_write_ha_state)
+        )
+
+
+class PlantaDueSensorEntity(PlantaHubEntity, SensorEntity):
+    """Planta due sensor entity, reporting the plants due for an action."""
+
+    entity_description: PlantaDueSensorEntityDescription
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        return self.coordinator.last_update_success
+
+    async def async_added_to_hass(self) -> None:
+        """Update the plants due when the plants change and as time passes."""
+        await super().async_added_to_hass()
+        self._async_update(dt_util.utcnow())
+        self.async_on_remove(
+            self.coordinator.async_add_listener(self._handle_coordinator_update)
+        )
+        self.async_on_remove(self.coordinator.async_add_tick_listener(self._async_tick))
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._async_update(dt_util.utcnow())
+        self.async_write_ha_state()
+
+    @callback
+    def _async_tick(self, now: datetime) -> None:
+        """Write the state if the plants due changed."""
+        previous = self._attr_native_value, self._attr_extra_state_attributes
+        self._async_update(now)
+        if (self._attr_native_value, self._attr_extra_state_attributes) != previous:
+            self.async_write_ha_state()
+
+    @callback
+    def _async_update(self, now: datetime) -> None:
+        """Update the value and the plant ids from the due index."""
+        description = self.entity_description
+        dates = self.coordinator.due_index.dates(description.field, self.site)
+        entries = description.entries_fn(dates, now)
+        self._attr_native_value = description.value_fn(entries)
+        self._attr_extra_state_attributes = {
+            "plant_ids": [plant_id for _, plant_id in entries]
+        }
@@ -0,0 +1,176 @@
+"""Planta services."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Final
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import (
+    config_validation as cv,
+    device_registry as dr,
+    entity_registry as er,
+)
+from homeassistant.helpers.service import async_extract_referenced_entity_ids
+
+from .const import DOMAIN
+from .coordinator import PlantaCoordinator
+
+ATTR_ACTION_TYPE: Final = "action_type"
+ATTR_CONFIG_ENTRY_ID: Final = "config_entry_id"
+ATTR_MAX_CONCURRENCY: Final = "max_concurrency"
+ATTR_REFRESHES: Final = "refreshes"
+
+ACTION_TYPES: Final = ["cleaning", "fertilizing", "misting", "watering"]
+DEFAULT_MAX_CONCURRENCY: Final = 4
+DEFAULT_REFRESHES: Final = 3
+
+SERVICE_COMPLETE_ACTIONS: Final = "complete_actions"
+SERVICE_REFRESH: Final = "refresh"
+SERVICE_START_PROFILE: Final = "start_profile"
+
+# area, device, entity, floor and label ids
+TARGET_SCHEMA = cv.TARGET_SERVICE_FIELDS
+TARGET_KEYS: Final = tuple(str(key) for key in TARGET_SCHEMA)
+SERVICE_COMPLETE_ACTIONS_SCHEMA = vol.Schema(
+    {
+        **TARGET_SCHEMA,
+        vol.Required(ATTR_ACTION_TYPE): vol.In(ACTION_TYPES),
+        vol.Optional(ATTR_MAX_CONCURRENCY, default=DEFAULT_MAX_CONCURRENCY): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=20)
+        ),
+    }
+)
+SERVICE_REFRESH_SCHEMA = vol.Schema(TARGET_SCHEMA)
+SERVICE_START_PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_REFRESHES, default=DEFAULT_REFRESHES): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=20)
+        ),
+    }
+)
+
+
+@callback
+def async_get_target_plants(
+    hass: HomeAssistant, call: ServiceCall
+) -> dict[PlantaCoordinator, list[str]]:
+    """Return the plant ids targeted by a service call, by coordinator."""
+    selected = async_extract_referenced_entity_ids(hass, call)
+    entity_registry = er.async_get(hass)
+    device_ids = set(selected.referenced_devices)
+    for entity_id in selected.referenced | selected.indirectly_referenced:
+        if (entry := entity_registry.async_get(entity_id)) and entry.device_id:
+            device_ids.add(entry.device_id)
+
+    device_registry = dr.async_get(hass)
+    targets: dict[PlantaCoordinator, list[str]] = {}
+    for device_id in device_ids:
+        if not (device := device_registry.async_get(device_id)):
+            continue
+        for entry_id in device.config_entries:
+            entry = hass.config_entries.async_get_entry(entry_id)
+            if (
+                not entry
+                or entry.domain != DOMAIN
+                or entry.state is not ConfigEntryState.LOADED
+            ):
+                continue
+            coordinator: PlantaCoordinator = entry.runtime_data
+            targets.setdefault(coordinator, []).extend(
+                plant_id
+                for domain, identifier in device.identifiers
+                if domain == DOMAIN
+                and (plant_id := coordinator.plant_ids.get(identifier))
+            )
+    return {coordinator: ids for coordinator, ids in targets.items() if ids}
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Set up Planta services."""
+
+    async def async_complete_actions(call: ServiceCall) -> ServiceResponse:
+        """Complete an action for every targeted plant."""
+        if not (targets := async_get_target_plants(hass, call)):
+            raise ServiceValidationError("No Planta plants were targeted")
+        action_type = call.data[ATTR_ACTION_TYPE]
+        max_concurrency = call.data[ATTR_MAX_CONCURRENCY]
+
+        results = await asyncio.gather(
+            *(
+                coordinator.async_complete_actions(
+                    plant_ids, action_type, max_concurrency
+                )
+                for coordinator, plant_ids in targets.items()
+            )
+        )
+        return {
+            "plants": {
+                plant_id: {"success": error is None, "error": error}
+                for errors in results
+                for plant_id, error in errors.items()
+            }
+        }
+
+    async def async_refresh(call: ServiceCall) -> None:
+        """Refresh the targeted plants, or every plant if none are targeted."""
+        if not any(key in call.data for key in TARGET_KEYS):
+            for entry in hass.config_entries.async_entries(DOMAIN):
+                if entry.state is ConfigEntryState.LOADED:
+                    await entry.runtime_data.async_request_refresh()
+            return
+        if not (targets := async_get_target_plants(hass, call)):
+            raise ServiceValidationError("No Planta plants were targeted")
+        await asyncio.gather(
+            *(
+                coordinator.async_request_plant_refresh(plant_ids)
+                for coordinator, plant_ids in targets.items()
+            )
+        )
+
+    async def async_start_profile(call: ServiceCall) -> None:
+        """Profile the next refreshes of an account, or of every account."""
+        entries = [
+            entry
+            for entry in hass.config_entries.async_entries(DOMAIN)
+            if entry.state is ConfigEntryState.LOADED
+            and call.data.get(ATTR_CONFIG_ENTRY_ID, entry.entry_id) == entry.entry_id
+        ]
+        if not entries:
+            raise ServiceValidationError("No loaded Planta account was found")
+        coordinators: list[PlantaCoordinator] = [
+            entry.runtime_data for entry in entries
+        ]
+        if any(coordinator.profiler for coordinator in coordinators):
+            raise ServiceValidationError("A profile is already running")
+        for coordinator in coordinators:
+            coordinator.async_start_profile(call.data[ATTR_REFRESHES])
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_COMPLETE_ACTIONS,
+        async_complete_actions,
+        schema=SERVICE_COMPLETE_ACTIONS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_REFRESH, async_refresh, schema=SERVICE_REFRESH_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_PROFILE,
+        async_start_profile,
+        schema=SERVICE_START_PROFILE_SCHEMA,
+    )
@@ -0,0 +1,554 @@
+"""Offline benchmarks of the Planta API client against the local stand-in.
+
+Measures throughput, latency percentiles and memory of plant listing, single
+plant requests, completing actions, token refreshes and coordinator refreshes
+at several plant counts, and fails if any result regressed against the stored
+baseline.
+
+Timings vary too much between runs and machines to compare as is, so by
+default only ratios between timings of the same run are compared, along with
+memory, request and listener counts. Pass `--timings` to also compare the
+timings. A full listing with the default rate limiter must also finish within
+an absolute budget.
+
+    python scripts/bench/benchmark.py
+    python scripts/bench/benchmark.py --sizes 10 1000 --update-baseline
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable
+import json
+from pathlib import Path
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from types import MappingProxyType
+from typing import Any
+
+from aiohttp import ClientSession
+from standin import StandInConfig, StandInServer, create_token
+
+from homeassistant.config_entries import SOURCE_USER, ConfigEntries, ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+
+ROOT = Path(__file__).resolve().parents[2]
+# import through the package, so its modules can't shadow the standard library
+sys.path.insert(0, str(ROOT))
+
+from custom_components.planta import pyplanta  # noqa: E402
+from custom_components.planta.const import DOMAIN  # noqa: E402
+from custom_components.planta.coordinator import PlantaCoordinator  # noqa: E402
+from custom_components.planta.pyplanta import Planta  # noqa: E402
+from custom_components.planta.pyplanta.exceptions import PlantaError  # noqa: E402
+from custom_components.planta.pyplanta.models import Plant  # noqa: E402
+from custom_components.planta.pyplanta.ratelimit import RateLimiter  # noqa: E402
+
+BASELINE = Path(__file__).with_name("baseline.json")
+DEFAULT_SIZES = (10, 1000, 10000)
+# relative regression allowed of timings and their ratios
+DEFAULT_TOLERANCE = 0.5
+# relative regression allowed of memory and request counts
+COUNT_TOLERANCE = 0.1
+# regressions smaller than these absolute differences are treated as noise,
+# by the first matching suffix
+NOISE = {"p95_ms": 10.0, "p99_ms": 10.0, "_ms": 2.0, "_kib": 64.0}
+TIMINGS = ("_ms", "_per_s")
+RATIOS = ("overhead_x", "speedup_x")
+HIGHER_IS_BETTER = ("_per_s", "speedup_x")
+# rounds that scenarios compared with each other alternate in
+ROUNDS = 10
+# longest a full listing may take with the default rate limiter, in ms, about
+# twice the pacing of 10,000 plants so a full sync stays well within a poll
+BUDGETS = {"list_limited/elapsed_ms": 15_000.0}
+
+Results = dict[str, float]
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Return a percentile of some values."""
+    values = sorted(values)
+    return values[min(int(q * len(values)), len(values) - 1)]
+
+
+def latency_results(name: str, durations: list[float]) -> Results:
+    """Return the latency percentiles of some durations, in milliseconds."""
+    if not durations:
+        return {}
+    return {
+        f"{name}/p50_ms": percentile(durations, 0.5) * 1000,
+        f"{name}/p95_ms": percentile(durations, 0.95) * 1000,
+        f"{name}/p99_ms": percentile(durations, 0.99) * 1000,
+    }
+
+
+async def run_calls(
+    calls: list[Callable[[], Awaitable[Any]]], concurrency: int
+) -> tuple[list[float], int, float]:
+    """Run calls with limited concurrency.
+
+    Returns the duration of each successful call, the number of failed calls
+    and the total duration.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    durations: list[float] = []
+    errors = 0
+
+    async def _run(call: Callable[[], Awaitable[Any]]) -> None:
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await call()
+            except PlantaError:
+                errors += 1
+            else:
+                durations.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(_run(call) for call in calls))
+    return durations, errors, time.perf_counter() - start
+
+
+def call_results(
+    name: str, durations: list[float], errors: int, total: float
+) -> Results:
+    """Return the throughput, latency percentiles and number of failed calls."""
+    return {
+        f"{name}/requests_per_s": len(durations) / total,
+        **latency_results(name, durations),
+        f"{name}/errors": errors,
+    }
+
+
+async def timed(
+    name: str, calls: list[Callable[[], Awaitable[Any]]], concurrency: int
+) -> tuple[Results, list[float]]:
+    """Run calls with limited concurrency.
+
+    Returns the throughput, latency percentiles and number of failed calls,
+    along with the duration of each successful call.
+    """
+    durations, errors, total = await run_calls(calls, concurrency)
+    return call_results(name, durations, errors, total), durations
+
+
+async def timed_together(
+    scenarios: dict[str, list[Callable[[], Awaitable[Any]]]],
+    concurrency: int,
+    rounds: int,
+) -> Results:
+    """Run the calls of several scenarios in alternating rounds.
+
+    Each scenario sees the same load on this machine, so ratios between their
+    timings hold even if the load changes meanwhile.
+    """
+    measured: dict[str, tuple[list[float], int, float]] = {
+        name: ([], 0, 0.0) for name in scenarios
+    }
+    for index in range(rounds):
+        for name, calls in scenarios.items():
+            durations, errors, total = await run_calls(
+                calls[index::rounds], concurrency
+            )
+            previous = measured[name]
+            measured[name] = (
+                previous[0] + durations,
+                previous[1] + errors,
+                previous[2] + total,
+            )
+    return {
+        key: value
+        for name, (durations, errors, total) in measured.items()
+        for key, value in call_results(name, durations, errors, total).items()
+    }
+
+
+def create_client(session: ClientSession, tokens: dict[str, str]) -> Planta:
+    """Return a client that isn't held back by the shared rate limiter."""
+    return Planta(
+        session=session,
+        tokens=tokens,
+        rate_limiter=RateLimiter(rate=1_000_000, capacity=1_000_000),
+    )
+
+
+async def bench_coordinator(
+    server: StandInServer, client: Planta, args: argparse.Namespace
+) -> Results:
+    """Benchmark coordinator refreshes with a listener per plant, as entities add.
+
+    Covers the projection, fingerprinting, index updates and listener dispatch
+    on top of listing the plants, compared with listing them with the client.
+    """
+    results: Results = {}
+    size = len(server.plants)
+    calls = 0
+
+    def plant_updated() -> None:
+        nonlocal calls
+        calls += 1
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        hass.config_entries = ConfigEntries(hass, {})
+        await dr.async_load(hass)
+        entry = ConfigEntry(
+            data={},
+            discovery_keys=MappingProxyType({}),
+            domain=DOMAIN,
+            minor_version=1,
+            options={},
+            source=SOURCE_USER,
+            title="Benchmark",
+            unique_id=None,
+            version=1,
+        )
+        coordinator = PlantaCoordinator(hass, entry, client)
+        client.clear_cache()
+        start = time.perf_counter()
+        await coordinator.async_refresh()
+        if not coordinator.last_update_success:
+            await hass.async_stop(force=True)
+            return results
+        results["coordinator_first/elapsed_ms"] = (time.perf_counter() - start) * 1000
+        for plant_id in coordinator.data:
+            coordinator.async_add_listener(plant_updated, plant_id)
+
+        async def list_plants() -> None:
+            """List and parse every plant with the client alone."""
+            client.clear_cache()
+            plants = (await client.get_plants())["plants"]
+            assert len([Plant.from_dict(plant) for plant in plants]) == size
+
+        # listeners woken by each scenario
+        woken = {"coordinator_refresh": 0, "coordinator_refresh_changed": 0}
+
+        async def refresh() -> None:
+            """Refresh every plant, none of which changed."""
+            client.clear_cache()
+            before = calls
+            await coordinator.async_refresh()
+            woken["coordinator_refresh"] += calls - before
+
+        # the pages of the watered plants change, the others are not modified
+        rng = random.Random(size)
+        watered = rng.sample(list(coordinator.data), min(args.targets, size))
+
+        async def refresh_changed() -> None:
+            """Refresh every plant after some were watered."""
+            server.water(watered)
+            before = calls
+            await coordinator.async_refresh()
+            woken["coordinator_refresh_changed"] += calls - before
+
+        results.update(
+            await timed_together(
+                {
+                    "coordinator_reference": [list_plants] * args.repeat,
+                    "coordinator_refresh": [refresh] * args.repeat,
+                    "coordinator_refresh_changed": [refresh_changed] * args.repeat,
+                },
+                1,
+                args.repeat,
+            )
+        )
+        for name, count in woken.items():
+            # only the listeners of the plants that changed should be woken
+            results[f"{name}/listener_calls"] = count / args.repeat
+        await coordinator.async_shutdown()
+        await hass.async_stop(force=True)
+    return results
+
+
+async def bench_size(size: int, args: argparse.Namespace) -> Results:
+    """Run every benchmark against a stand-in with some plants."""
+    config = StandInConfig(
+        plants=size,
+        page_size=args.page_size,
+        latency=args.latency,
+        error_rate=args.error_rate,
+    )
+    results: Results = {}
+    async with StandInServer(config) as server, ClientSession() as session:
+        pyplanta.API_V1_ENDPOINT = server.url
+        client = create_client(session, create_token(config.token_lifetime))
+        rng = random.Random(size)
+
+        async def list_plants() -> None:
+            """List and parse every plant, as done by a coordinator refresh."""
+            client.clear_cache()
+            plants = (await client.get_plants())["plants"]
+            assert len([Plant.from_dict(plant) for plant in plants]) == size
+
+        # listing again is answered with 304 not modified, alternating with
+        # listings without the cache to compare them under the same load
+        before = server.stats.requests.get("/v1/addedPlants", 0)
+        results.update(
+            await timed_together(
+                {
+                    "list": [list_plants] * args.repeat,
+                    "list_cached": [client.get_plants] * args.repeat,
+                },
+                1,
+                args.repeat,
+            )
+        )
+        # pages requested per listing, with or without the cache
+        results["list/server_calls"] = (
+            server.stats.requests.get("/v1/addedPlants", 0) - before
+        ) / (2 * args.repeat)
+        for name in ("list", "list_cached"):
+            if median := results.get(f"{name}/p50_ms"):
+                results[f"{name}/plants_per_s"] = size / median * 1000
+
+        # memory held by the parsed plants and the response cache, once the
+        # API data is dropped as done by a coordinator refresh
+        client.clear_cache()
+        tracemalloc.start()
+        try:
+            models = [
+                Plant.from_dict(plant)
+                for plant in (await client.get_plants())["plants"]
+            ]
+            current, peak = tracemalloc.get_traced_memory()
+            assert len(models) == size
+        except PlantaError:
+            pass
+        else:
+            results["memory/peak_kib"] = peak / 1024
+            results["memory/per_plant_kib"] = current / 1024 / size
+        finally:
+            tracemalloc.stop()
+
+        plant_ids = [plant["id"] for plant in server.plants]
+        requests = [rng.choice(plant_ids) for _ in range(args.requests)]
+
+        async def fetch_plant(plant_id: str) -> None:
+            """Get a plant without the client, as a reference for this machine."""
+            async with session.get(
+                f"{server.url}/addedPlants/{plant_id}",
+                headers={"Authorization": f"Bearer {client.tokens['accessToken']}"},
+            ) as resp:
+                await resp.read()
+                if resp.status >= 400:
+                    raise PlantaError(f"HTTP {resp.status} Error")
+
+        results.update(
+            await timed_together(
+                {
+                    "reference": [
+                        lambda plant_id=plant_id: fetch_plant(plant_id)
+                        for plant_id in requests
+                    ],
+                    "get_plant": [
+                        lambda plant_id=plant_id: client.get_plant(plant_id)
+                        for plant_id in requests
+                    ],
+                },
+                args.concurrency,
+                ROUNDS,
+            )
+        )
+
+        stats, _ = await timed(
+            "complete",
+            [
+                lambda plant_id=plant_id: client.plant_action_complete(
+                    plant_id, "watering"
+                )
+                for plant_id in requests
+            ],
+            args.concurrency,
+        )
+        results.update(stats)
+
+        # a targeted refresh of several plants at once
+        targets = rng.sample(plant_ids, min(args.targets, size))
+        stats, durations = await timed(
+            "get_plants_by_id",
+            [lambda: client.get_plants_by_id(targets)] * args.repeat,
+            1,
+        )
+        results.update(stats)
+        if durations:
+            results["get_plants_by_id/plants_per_s"] = len(targets) / statistics.median(
+                durations
+            )
+
+        # the same refresh paced by the default rate limiter, as against the API
+        limited = Planta(session=session, tokens=client.tokens)
+        try:
+            result = await limited.get_plants_by_id(targets)
+        except PlantaError:
+            pass
+        else:
+            results["get_plants_by_id_limited/plants_per_s"] = (
+                len(targets) / result.elapsed
+            )
+            results["get_plants_by_id_limited/request_ms"] = result.request_time * 1000
+            results["get_plants_by_id_limited/elapsed_ms"] = result.elapsed * 1000
+        await limited.close()
+
+        # a full listing paced by the default rate limiter of a new session, as
+        # the first full sync after starting against the API
+        async with ClientSession() as limited_session:
+            limited = Planta(session=limited_session, tokens=client.tokens)
+            start = time.perf_counter()
+            try:
+                assert len((await limited.get_plants())["plants"]) == size
+            except PlantaError:
+                pass
+            else:
+                results["list_limited/elapsed_ms"] = (
+                    time.perf_counter() - start
+                ) * 1000
+            await limited.close()
+
+        results.update(await bench_coordinator(server, client, args))
+
+        # concurrent refreshes should share a single request
+        before = server.stats.requests.get("/v1/auth/refreshToken", 0)
+        stats, _ = await timed(
+            "token_refresh",
+            [lambda: client.refresh_tokens(force=True)] * args.concurrency,
+            args.concurrency,
+        )
+        results.update(stats)
+        results["token_refresh/server_calls"] = (
+            server.stats.requests.get("/v1/auth/refreshToken", 0) - before
+        )
+
+        await client.close()
+
+    # ratios between timings of this run, which hold on any machine
+    if results.get("get_plant/p50_ms") and results.get("reference/p50_ms"):
+        # of a single plant request with the client over the bare session
+        results["get_plant/overhead_x"] = (
+            results["get_plant/p50_ms"] / results["reference/p50_ms"]
+        )
+    if results.get("list/p50_ms") and results.get("list_cached/p50_ms"):
+        results["list_cached/speedup_x"] = (
+            results["list/p50_ms"] / results["list_cached/p50_ms"]
+        )
+    if results.get("get_plant/p50_ms") and results.get("get_plants_by_id/p50_ms"):
+        # over requesting the plants one after the other
+        results["get_plants_by_id/speedup_x"] = (
+            results["get_plant/p50_ms"]
+            * len(targets)
+            / results["get_plants_by_id/p50_ms"]
+        )
+    if results.get("get_plant/p50_ms") and results.get(
+        "get_plants_by_id_limited/elapsed_ms"
+    ):
+        # the same with the default rate limiter, which lets the batch through
+        results["get_plants_by_id_limited/speedup_x"] = (
+            results["get_plant/p50_ms"]
+            * len(targets)
+            / results["get_plants_by_id_limited/elapsed_ms"]
+        )
+    if results.get("coordinator_reference/p50_ms"):
+        # of a coordinator refresh over listing and parsing with the client
+        for name in ("coordinator_refresh", "coordinator_refresh_changed"):
+            if median := results.get(f"{name}/p50_ms"):
+                results[f"{name}/overhead_x"] = (
+                    median / results["coordinator_reference/p50_ms"]
+                )
+    return {f"{size}/{key}": value for key, value in results.items()}
+
+
+def regressions(
+    results: Results, baseline: Results, tolerance: float, timings: bool = False
+) -> list[tuple[str, float, float]]:
+    """Return the results that regressed against the baseline.
+
+    Timings are only compared if `timings` is set.
+    """
+    regressed = []
+    for key, value in results.items():
+        if (expected := baseline.get(key)) is None:
+            continue
+        if key.endswith(TIMINGS) and not timings:
+            continue
+        limit = tolerance if key.endswith(TIMINGS + RATIOS) else COUNT_TOLERANCE
+        if key.endswith(HIGHER_IS_BETTER):
+            worse = value < expected * (1 - limit)
+        else:
+            noise = next((n for s, n in NOISE.items() if key.endswith(s)), 0)
+            worse = value > expected * (1 + limit) and value - expected > noise
+        if worse:
+            regressed.append((key, expected, value))
+    return regressed
+
+
+def over_budget(results: Results) -> list[tuple[str, float, float]]:
+    """Return the timings over their absolute budget, on any machine."""
+    return [
+        (key, budget, value)
+        for key, value in results.items()
+        for suffix, budget in BUDGETS.items()
+        if key.endswith(suffix) and value > budget
+    ]
+
+
+async def run(args: argparse.Namespace) -> int:
+    """Run the benchmarks, returning the exit code."""
+    results: Results = {}
+    for size in args.sizes:
+        print(f"Benchmarking {size} plants...", file=sys.stderr)
+        results.update(await bench_size(size, args))
+
+    for key, value in results.items():
+        print(f"{key:45} {value:12.2f}")
+
+    if exceeded := over_budget(results):
+        print(f"\n{len(exceeded)} over budget:", file=sys.stderr)
+        for key, budget, value in exceeded:
+            print(f"  {key}: {value:.2f} > {budget:.2f}", file=sys.stderr)
+        return 1
+
+    if args.update_baseline:
+        BASELINE.write_text(
+            json.dumps({k: round(v, 3) for k, v in results.items()}, indent=2) + "\n"
+        )
+        print(f"Baseline written to {BASELINE}", file=sys.stderr)
+        return 0
+    if not BASELINE.exists():
+        print("No baseline, run with --update-baseline first", file=sys.stderr)
+        return 0
+
+    baseline = json.loads(BASELINE.read_text())
+    if regressed := regressions(results, baseline, args.tolerance, args.timings):
+        print(f"\n{len(regressed)} regression(s):", file=sys.stderr)
+        for key, expected, value in regressed:
+            print(f"  {key}: {expected:.2f} -> {value:.2f}", file=sys.stderr)
+        return 1
+    print("\nNo regressions", file=sys.stderr)
+    return 0
+
+
+def main() -> None:
+    """Parse the arguments and run the benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--page-size", type=int, default=StandInConfig.page_size)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--targets", type=int, default=20)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--timings", action="store_true")
+    parser.add_argument("--update-baseline", action="store_true")
+    sys.exit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Benchmark JSON decoding paths on synthetic plant pages.
+
+Compares the standard library and orjson, decoded inline as the client does
+or in an executor, by decode time and by the longest the event loop was blocked
+while decoding. Decoding holds the GIL, so the executor doesn't shorten stalls.
+
+    python scripts/bench/decode.py --sizes 100 1000 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable
+import json
+from pathlib import Path
+import random
+import statistics
+import sys
+import time
+from typing import Any
+
+from standin import generate_plant
+
+ROOT = Path(__file__).resolve().parents[2]
+# import through the package, so its modules can't shadow the standard library
+sys.path.insert(0, str(ROOT))
+
+from custom_components.planta.pyplanta.decoder import JSONDecoder, orjson  # noqa: E402
+
+LOADERS: dict[str, Callable[[bytes], Any]] = {"json": json.loads}
+if orjson is not None:
+    LOADERS["orjson"] = orjson.loads
+
+
+def payload(size: int) -> bytes:
+    """Return a page of synthetic plants."""
+    rng = random.Random(size)
+    page = [generate_plant(index, rng) for index in range(size)]
+    return json.dumps({"data": page, "pagination": {"nextPage": None}}).encode()
+
+
+async def measure(
+    decode: Callable[[bytes], Awaitable[Any]], body: bytes, repeat: int
+) -> tuple[float, float]:
+    """Return the median decode time and longest event loop stall, in ms."""
+    stalls: list[float] = []
+    done = False
+
+    async def ticker() -> None:
+        while not done:
+            start = time.perf_counter()
+            await asyncio.sleep(0)
+            stalls.append(time.perf_counter() - start)
+
+    task = asyncio.create_task(ticker())
+    durations = []
+    # keep the results so freeing them isn't measured as a stall
+    results = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results.append(await decode(body))
+        durations.append(time.perf_counter() - start)
+        await asyncio.sleep(0)
+    done = True
+    await task
+    results.clear()
+    return statistics.median(durations) * 1000, max(stalls, default=0) * 1000
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Run the benchmarks."""
+    print(f"{'plants':>7} {'bytes':>10} {'path':18} {'decode ms':>10} {'stall ms':>9}")
+    for size in args.sizes:
+        body = payload(size)
+        for name, loads in LOADERS.items():
+            decoder = JSONDecoder(loads)
+
+            async def inline(body: bytes) -> Any:
+                return decoder.decode(body)
+
+            async def executor(body: bytes) -> Any:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(None, decoder.decode, body)
+
+            for decode in (inline, executor):
+                decode_ms, stall_ms = await measure(decode, body, args.repeat)
+                path = f"{name} {decode.__name__}"
+                print(
+                    f"{size:>7} {len(body):>10} {path:18} {decode_ms:>10.2f} {stall_ms:>9.2f}"
+                )
+
+
+def main() -> None:
+    """Parse the arguments and run the benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=(100, 1000, 10000))
+    parser.add_argument("--repeat", type=int, default=10)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Check that the Planta API client recovers from outages of the local stand-in.
+
+Each scenario breaks the stand-in in some way, restores it, and fails if the
+client doesn't get plants again afterwards.
+
+    python scripts/bench/recovery.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+import sys
+
+from aiohttp import ClientSession
+from standin import StandInConfig, StandInServer, create_token
+
+ROOT = Path(__file__).resolve().parents[2]
+# import through the package, so its modules can't shadow the standard library
+sys.path.insert(0, str(ROOT))
+
+from custom_components.planta import pyplanta  # noqa: E402
+from custom_components.planta.pyplanta import Planta  # noqa: E402
+from custom_components.planta.pyplanta.exceptions import PlantaError  # noqa: E402
+from custom_components.planta.pyplanta.ratelimit import RateLimiter  # noqa: E402
+from custom_components.planta.pyplanta.resilience import (  # noqa: E402
+    FAILURE_THRESHOLD,
+    CircuitBreaker,
+    endpoint_key,
+)
+
+# seconds the circuit stays open in the scenarios
+RESET_TIMEOUT = 0.1
+
+Scenario = Callable[[StandInServer, Planta], Awaitable[None]]
+
+
+async def open_circuit(server: StandInServer, client: Planta) -> None:
+    """Fail enough listings to open the circuit, then wait until it's half-open."""
+    server.config.error_rate = 1.0
+    server.config.error_status = 500
+    for _ in range(FAILURE_THRESHOLD):
+        try:
+            await client.get_plants()
+        except PlantaError:
+            pass
+    server.config.error_rate = 0.0
+    await asyncio.sleep(RESET_TIMEOUT * 2)
+
+
+async def cancelled_probe(server: StandInServer, client: Planta) -> None:
+    """A half-open probe cancelled by a timeout, as a coordinator refresh is."""
+    await open_circuit(server, client)
+    server.config.latency = 5.0
+    try:
+        async with asyncio.timeout(RESET_TIMEOUT):
+            await client.get_plants()
+    except TimeoutError:
+        pass
+    server.config.latency = 0.0
+
+
+async def invalid_probe(server: StandInServer, client: Planta) -> None:
+    """A half-open probe answered with a body that isn't valid JSON."""
+    await open_circuit(server, client)
+    client._decoder.loads = _invalid_loads(client._decoder.loads)
+    try:
+        await client.get_plants()
+    except ValueError:
+        pass
+
+
+def _invalid_loads(loads: Callable[[bytes], object]) -> Callable[[bytes], object]:
+    """Return a decoder that fails once, then decodes as before."""
+    failed = False
+
+    def _loads(body: bytes) -> object:
+        nonlocal failed
+        if not failed:
+            failed = True
+            return loads(b"{")
+        return loads(body)
+
+    return _loads
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "cancelled_probe": cancelled_probe,
+    "invalid_probe": invalid_probe,
+}
+
+
+async def run_scenario(name: str, scenario: Scenario) -> bool:
+    """Run a scenario, returning `True` if the client recovered."""
+    config = StandInConfig(plants=10)
+    async with StandInServer(config) as server, ClientSession() as session:
+        pyplanta.API_V1_ENDPOINT = server.url
+        client = Planta(
+            session=session,
+            tokens=create_token(config.token_lifetime),
+            max_retries=0,
+            rate_limiter=RateLimiter(rate=1_000_000, capacity=1_000_000),
+        )
+        key = endpoint_key("GET", f"{server.url}/addedPlants")
+        client.circuit_breakers[key] = CircuitBreaker(key, reset_timeout=RESET_TIMEOUT)
+        await scenario(server, client)
+        try:
+            plants = (await client.get_plants())["plants"]
+        except PlantaError as err:
+            print(f"{name:20} failed: {err!r}")
+            return False
+        print(f"{name:20} recovered with {len(plants)} plants")
+        return len(plants) == config.plants
+
+
+async def run(args: argparse.Namespace) -> int:
+    """Run the scenarios, returning the exit code."""
+    names = args.scenarios or list(SCENARIOS)
+    results = [await run_scenario(name, SCENARIOS[name]) for name in names]
+    return 0 if all(results) else 1
+
+
+def main() -> None:
+    """Parse the arguments and run the scenarios."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("scenarios", nargs="*", choices=[*SCENARIOS, []])
+    sys.exit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
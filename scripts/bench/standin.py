@@ -0,0 +1,306 @@
+"""Local stand-in for the Planta API.
+
+Serves synthetic plants from the endpoints used by the integration, with
+configurable latency, page size and error injection. Runs entirely offline.
+
+    python scripts/bench/standin.py --plants 1000 --port 8080
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from hashlib import sha256
+import json
+import random
+import time
+from typing import Any
+
+from aiohttp import web
+import jwt
+
+SECRET = "planta-stand-in-secret-key-000000"
+USER_ID = "stand-in-user"
+
+HEALTH = ["notset", "poor", "fair", "good", "verygood", "excellent"]
+SITES = ["Living room", "Kitchen", "Bedroom", "Office", "Balcony", "Bathroom"]
+SOILS = ["allpurposepottingmix", "cactussoil", "orchidpottingmix", "semihydro"]
+POTS = ["potplastic", "potterracotta", "potporcelain", "potoriginalplastic"]
+SPECIES = [
+    ("Monstera", "Monstera deliciosa"),
+    ("Snake plant", "Dracaena trifasciata"),
+    ("Pothos", "Epipremnum aureum"),
+    ("Fiddle leaf fig", "Ficus lyrata"),
+    ("Peace lily", "Spathiphyllum wallisii"),
+]
+ACTIONS = ["cleaning", "fertilizing", "misting", "progressUpdate", "repotting"]
+
+
+@dataclass
+class StandInConfig:
+    """Stand-in server configuration."""
+
+    plants: int = 100
+    page_size: int = 100
+    # seconds added to every response, plus up to `jitter` seconds at random
+    latency: float = 0.0
+    jitter: float = 0.0
+    # fraction of requests answered with `error_status`
+    error_rate: float = 0.0
+    error_status: int = 503
+    token_lifetime: int = 3600
+    seed: int = 0
+
+
+@dataclass
+class StandInStats:
+    """Requests served by the stand-in, by route."""
+
+    requests: dict[str, int] = field(default_factory=dict)
+    errors: int = 0
+
+    def count(self, route: str) -> None:
+        """Count a request."""
+        self.requests[route] = self.requests.get(route, 0) + 1
+
+
+def generate_plant(index: int, rng: random.Random) -> dict[str, Any]:
+    """Return a synthetic plant in the shape of the API data."""
+    now = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    localized_name, scientific_name = rng.choice(SPECIES)
+    plant_id = f"{USER_ID}:plant-{index:06d}"
+
+    def record(days: int) -> dict[str, str]:
+        date = now + timedelta(days=days, minutes=rng.randrange(1440))
+        return {"date": date.isoformat(), "type": rng.choice(["liquid", "solid"])}
+
+    actions = {
+        "watering": {"next": record(rng.randrange(1, 14)), "completed": record(-3)},
+        **{
+            action_type: {
+                "next": record(rng.randrange(1, 90)),
+                "completed": record(-rng.randrange(1, 90)),
+            }
+            for action_type in rng.sample(ACTIONS, rng.randrange(len(ACTIONS)))
+        },
+    }
+    return {
+        "id": plant_id,
+        "names": {
+            "custom": f"{localized_name} {index}" if rng.random() < 0.5 else None,
+            "localizedName": localized_name,
+            "scientific": scientific_name,
+            "variety": "Variegata" if rng.random() < 0.1 else None,
+        },
+        "site": {"name": rng.choice(SITES)},
+        "health": rng.choice(HEALTH),
+        "size": rng.randrange(5, 200),
+        "environment": {
+            "pot": {
+                "size": rng.randrange(6, 40),
+                "soil": rng.choice(SOILS),
+                "type": rng.choice(POTS),
+            }
+        },
+        "actions": actions,
+        "plantCare": {
+            "customWatering": {"enabled": rng.random() < 0.2, "intervalWarm": 7},
+            "customFertilizing": None,
+        },
+        "image": {
+            "url": f"https://images.example.invalid/{plant_id}.jpg",
+            "lastUpdated": now.isoformat(),
+        },
+    }
+
+
+def create_token(lifetime: int) -> dict[str, str]:
+    """Return a new set of tokens."""
+    return {
+        "accessToken": jwt.encode(
+            {
+                "sub": USER_ID,
+                "exp": int(time.time()) + lifetime,
+                "jti": str(time.time_ns()),
+            },
+            SECRET,
+        ),
+        "refreshToken": f"refresh-{time.time_ns()}",
+        "tokenType": "Bearer",
+    }
+
+
+def create_app(config: StandInConfig) -> web.Application:
+    """Create the stand-in application."""
+    rng = random.Random(config.seed)
+    plants = [generate_plant(index, rng) for index in range(config.plants)]
+    by_id = {plant["id"]: plant for plant in plants}
+    stats = StandInStats()
+    etags: dict[tuple[int, int], str] = {}
+
+    @web.middleware
+    async def middleware(request: web.Request, handler):
+        """Count requests and add the configured latency and errors."""
+        resource = request.match_info.route.resource
+        stats.count(resource.canonical if resource else request.path)
+        if delay := config.latency + rng.random() * config.jitter:
+            await asyncio.sleep(delay)
+        if config.error_rate and rng.random() < config.error_rate:
+            stats.errors += 1
+            return web.json_response(
+                {"errorType": "injected", "message": "Injected error"},
+                status=config.error_status,
+                headers={"Retry-After": "0"} if config.error_status == 503 else None,
+            )
+        return await handler(request)
+
+    def authorized(request: web.Request) -> bool:
+        """Return `True` if the request has a valid access token."""
+        scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+        try:
+            jwt.decode(token, SECRET, algorithms=["HS256"])
+        except jwt.PyJWTError:
+            return False
+        return scheme == "Bearer"
+
+    def unauthorized() -> web.Response:
+        return web.json_response(
+            {"errorType": "unauthorized", "message": "Unauthorized"}, status=401
+        )
+
+    async def authorize(request: web.Request) -> web.Response:
+        if not (await request.json()).get("code"):
+            return unauthorized()
+        return web.json_response({"data": create_token(config.token_lifetime)})
+
+    async def refresh_token(request: web.Request) -> web.Response:
+        if not (await request.json()).get("refreshToken"):
+            return unauthorized()
+        return web.json_response({"data": create_token(config.token_lifetime)})
+
+    async def added_plants(request: web.Request) -> web.Response:
+        if not authorized(request):
+            return unauthorized()
+        start = int(request.query.get("cursor", 0))
+        limit = int(request.query.get("limit", config.page_size))
+        page = plants[start : start + limit]
+        if (start, limit) not in etags:
+            body = json.dumps(page, separators=(",", ":")).encode()
+            etags[start, limit] = f'"{sha256(body).hexdigest()[:16]}"'
+        etag = etags[start, limit]
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        next_page = str(start + limit) if start + limit < len(plants) else None
+        return web.json_response(
+            {"data": page, "pagination": {"nextPage": next_page}},
+            headers={"ETag": etag},
+        )
+
+    async def added_plant(request: web.Request) -> web.Response:
+        if not authorized(request):
+            return unauthorized()
+        if (plant := by_id.get(request.match_info["plant_id"])) is None:
+            return web.json_response(
+                {"errorType": "notFound", "message": "Plant not found"}, status=404
+            )
+        return web.json_response({"data": plant})
+
+    async def complete_action(request: web.Request) -> web.Response:
+        if not authorized(request):
+            return unauthorized()
+        if request.match_info["plant_id"] not in by_id:
+            return web.json_response(
+                {"errorType": "notFound", "message": "Plant not found"}, status=404
+            )
+        await request.json()
+        return web.Response(status=204)
+
+    app = web.Application(middlewares=[middleware])
+    app["plants"] = plants
+    app["etags"] = etags
+    app["stats"] = stats
+    app.router.add_post("/v1/auth/authorize", authorize)
+    app.router.add_post("/v1/auth/refreshToken", refresh_token)
+    app.router.add_get("/v1/addedPlants", added_plants)
+    app.router.add_get("/v1/addedPlants/{plant_id}", added_plant)
+    app.router.add_post("/v1/addedPlants/{plant_id}/actions/complete", complete_action)
+    return app
+
+
+class StandInServer:
+    """Run the stand-in on a local port."""
+
+    def __init__(self, config: StandInConfig, port: int = 0) -> None:
+        """Initialize the server."""
+        # changes to the config apply to the running server
+        self.config = config
+        self.app = create_app(config)
+        self.port = port
+        self._runner = web.AppRunner(self.app, access_log=None)
+
+    @property
+    def plants(self) -> list[dict[str, Any]]:
+        """Return the synthetic plants."""
+        return self.app["plants"]
+
+    def water(self, plant_ids: Iterable[str]) -> None:
+        """Mark some plants as watered just now, changing their pages."""
+        date = datetime.now(timezone.utc).isoformat()
+        plant_ids = set(plant_ids)
+        for plant in self.plants:
+            if plant["id"] in plant_ids:
+                plant["actions"]["watering"]["completed"]["date"] = date
+        self.app["etags"].clear()
+
+    @property
+    def stats(self) -> StandInStats:
+        """Return the request statistics."""
+        return self.app["stats"]
+
+    @property
+    def url(self) -> str:
+        """Return the base url of the API."""
+        return f"http://127.0.0.1:{self.port}/v1"
+
+    async def __aenter__(self) -> StandInServer:
+        await self._runner.setup()
+        await web.TCPSite(self._runner, "127.0.0.1", self.port).start()
+        self.port = self._runner.addresses[0][1]
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        await self._runner.cleanup()
+
+
+def main() -> None:
+    """Run the stand-in until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--plants", type=int, default=StandInConfig.plants)
+    parser.add_argument("--page-size", type=int, default=StandInConfig.page_size)
+    parser.add_argument("--latency", type=float, default=StandInConfig.latency)
+    parser.add_argument("--jitter", type=float, default=StandInConfig.jitter)
+    parser.add_argument("--error-rate", type=float, default=StandInConfig.error_rate)
+    parser.add_argument("--error-status", type=int, default=StandInConfig.error_status)
+    parser.add_argument(
+        "--token-lifetime", type=int, default=StandInConfig.token_lifetime
+    )
+    args = parser.parse_args()
+    config = StandInConfig(
+        plants=args.plants,
+        page_size=args.page_size,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        token_lifetime=args.token_lifetime,
+    )
+    print(f"Serving {config.plants} plants on http://127.0.0.1:{args.port}/v1")
+    web.run_app(create_app(config), host="127.0.0.1", port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()